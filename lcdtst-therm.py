@@ -106,9 +106,10 @@ def disp_init():
 def disp_off(lcd):
     """Off display."""
 
-    lcd.clear_display()
-    lcd.ret_home()
-    lcd.dispctl_set(disp_on=False)
+    with lcd.deferred():
+        lcd.clear_display()
+        lcd.ret_home()
+        lcd.dispctl_set(disp_on=False)
 
 def disp_clock(lcd):
     """Display clock."""
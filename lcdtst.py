@@ -189,9 +189,10 @@ def reinit(lcd):
 
     sys.stdout.write('Reinitializing LCD ...')
     lcd.initialize()
-    lcd.emode_set(increment=True)
-    lcd.dispctl_set(disp_on=True, curs_on=True, blink_on=True)
-    lcd.gcmpwr_set(intpwr=False)
+    with lcd.deferred():
+        lcd.emode_set(increment=True)
+        lcd.dispctl_set(disp_on=True, curs_on=True, blink_on=True)
+        lcd.gcmpwr_set(intpwr=False)
     sys.stdout.write(' done\n')
 
 def quit_prog(lcd):
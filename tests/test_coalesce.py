@@ -0,0 +1,64 @@
+"""
+    Latest-wins update coalescer in front of WS0010 on emulated PCF8574.
+"""
+
+import time
+import unittest
+from ws0010 import PCF8574Emulator, WS0010
+from ws0010.coalesce import Coalescer
+
+class CoalescerTest(unittest.TestCase):
+
+    def make(self, **kwargs):
+        em = PCF8574Emulator()
+        lcd = WS0010(0, 0, transport=em, buffered=True)
+        lcd.dispctl_set(disp_on=True)
+        return (em, Coalescer(lcd, **kwargs))
+
+    def test_latest_wins(self):
+        (em, co) = self.make()
+        co.putline('first', 1)
+        co.putline('second', 1)
+        co.write(2, 3, 'abc')
+        self.assertEqual(co.pending(), 2)
+        self.assertEqual(co.superseded, 5)
+        self.assertEqual(co.pump(), 2)
+        self.assertEqual(em.controller.screen(), [b'second          ', b'   abc          '])
+
+    def test_nothing_to_write(self):
+        (em, co) = self.make()
+        co.putline('', 1)
+        co.write(2, 100, 'x')
+        self.assertEqual(co.pending(), 0)
+        self.assertIsNone(co.wait_time())
+        self.assertEqual(co.pump(), 0)
+        co.flush()
+        self.assertEqual(Coalescer._fields(1, {}), [])
+
+    def test_budget(self):
+        now = [0.0]
+        (em, co) = self.make(rate=100, clock=lambda: now[0])
+        co.putline('x' * 16, 1)
+        co.putline('y' * 16, 2)
+        self.assertEqual(co.pump(), 1)
+        self.assertGreater(co.wait_time(), 0)
+        now[0] += 100
+        self.assertEqual(co.pump(), 1)
+        self.assertEqual(em.controller.screen(), [b'xxxxxxxxxxxxxxxx', b'yyyyyyyyyyyyyyyy'])
+
+    def test_worker(self):
+        (em, co) = self.make()
+        co.start()
+        try:
+            co.putline('', 1)
+            co.putline('hello', 2)
+            deadline = time.monotonic() + 5
+            while co.sent < 1 and time.monotonic() < deadline:
+                time.sleep(.01)
+            self.assertTrue(co._thread.is_alive())
+        finally:
+            co.stop()
+        self.assertEqual(em.controller.screen()[1], b'hello           ')
+
+if __name__ == '__main__':
+    unittest.main()
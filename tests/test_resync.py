@@ -0,0 +1,113 @@
+"""
+    Recovery of WS0010 4-bit interface alignment on emulated PCF8574.
+    Stray nibbles are injected into controller in every driver mode,
+    controller state must match host copy and screen must match the screen
+    of the same operations without fault after check_sync().
+"""
+
+import unittest
+from ws0010 import PCF8574Emulator, WS0010
+
+MODES = (
+    ('unbuffered', dict(buffered=False)),
+    ('buffered', dict(buffered=True)),
+    ('timed', dict(buffered=True, timed=True)),
+)
+
+class ResyncTest(unittest.TestCase):
+
+    def make(self, **kwargs):
+        em = PCF8574Emulator()
+        lcd = WS0010(0, 0, transport=em, **kwargs)
+        lcd.dispctl_set(disp_on=True)
+        lcd.putline('Hello world', 1)
+        lcd.putline('Second line', 2)
+        return (em, lcd)
+
+    def assertInSync(self, em, lcd, ops, **kwargs):
+        (ref, ref_lcd) = self.make(**kwargs)
+        ops(ref_lcd)
+        self.assertEqual(em.controller.screen(), ref.controller.screen())
+        c = em.controller
+        self.assertIsNone(c.pending)
+        self.assertEqual(bytes(lcd._shadow), bytes(c.ddram))
+        self.assertEqual(lcd._dshift, c.shift)
+        self.assertEqual(lcd._ac, c.ac)
+
+    def test_shift_after_stray_nibble(self):
+        # Stray 0 nibble turns the shift into Clear Display
+        for (name, kwargs) in MODES:
+            for nibble in range(16):
+                with self.subTest(mode=name, nibble=nibble):
+                    (em, lcd) = self.make(**kwargs)
+                    em.controller.pending = nibble
+                    ops = lambda lcd: lcd.shift_display(-3)
+                    ops(lcd)
+                    lcd.check_sync()
+                    self.assertInSync(em, lcd, ops, **kwargs)
+
+    def test_write_after_stray_nibble(self):
+        for (name, kwargs) in MODES:
+            for nibble in range(16):
+                with self.subTest(mode=name, nibble=nibble):
+                    (em, lcd) = self.make(**kwargs)
+                    em.controller.pending = nibble
+                    ops = lambda lcd: lcd.putline('Third', 2)
+                    ops(lcd)
+                    lcd.check_sync()
+                    self.assertInSync(em, lcd, ops, **kwargs)
+
+    def test_check_sync_detects_stray_nibble(self):
+        for (name, kwargs) in MODES:
+            with self.subTest(mode=name):
+                (em, lcd) = self.make(**kwargs)
+                em.controller.pending = 0
+                self.assertFalse(lcd.check_sync())
+                self.assertTrue(lcd.check_sync())
+                self.assertInSync(em, lcd, lambda lcd: None, **kwargs)
+
+    def test_dropped_nibble(self):
+        # Every nibble of a write in turn is lost on the bus
+        for (name, kwargs) in MODES:
+            for drop in range(1, 40):
+                with self.subTest(mode=name, drop=drop):
+                    (em, lcd) = self.make(**kwargs)
+                    send4 = lcd._send4
+                    count = [0]
+                    def lossy(*args):
+                        count[0] += 1
+                        if count[0] != drop:
+                            send4(*args)
+                    ops = lambda lcd: lcd.write_many([(1, 6, 'there'), (2, 0, 'Other')])
+                    lcd._send4 = lossy
+                    ops(lcd)
+                    lcd._send4 = send4
+                    lcd.check_sync()
+                    self.assertInSync(em, lcd, ops, **kwargs)
+
+    def test_dropped_nibble_in_glyph_upload(self):
+        # Every nibble of a write uploading custom glyph in turn is lost on the bus
+        rows = bytes([0x04, 0x0E, 0x1F, 0x0E, 0x0A, 0x11, 0x00, 0x00])
+        def ops(lcd):
+            lcd.glyph_define('\u2605', rows, '*')
+            lcd.putline('a\u2605b', 1)
+        for (name, kwargs) in MODES:
+            for drop in range(1, 60):
+                with self.subTest(mode=name, drop=drop):
+                    (em, lcd) = self.make(**kwargs)
+                    send4 = lcd._send4
+                    count = [0]
+                    def lossy(*args):
+                        count[0] += 1
+                        if count[0] != drop:
+                            send4(*args)
+                    lcd._send4 = lossy
+                    ops(lcd)
+                    lcd._send4 = send4
+                    lcd.check_sync()
+                    self.assertInSync(em, lcd, ops, **kwargs)
+                    self.assertEqual(bytes(em.controller.cgram[:8]), rows)
+                    self.assertEqual(em.controller.screen()[0][:3], b'a\x00b')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,39 @@
 """
 
 from .ws0010 import WS0010
+from .transport import Transport, I2CDevTransport
+from .i2cbus import I2CBus
+from .emulator import PCF8574Emulator, WS0010Controller
+from .stats import Stats, Histogram
+from .aio import AsyncWS0010
+from .coalesce import Coalescer
+from .sched import Scheduler
+from .group import DisplayGroup
+from .lock import BusLock
+from .graphics import Bitmap
+from .bigclock import BigClock
+from .marquee import Marquee
 
 __version__ = "1.0.0"
 __author__  = "Sergey Nikiforov"
 __email__   = "yooozh@gmail.com"
 __all__     = [
+    'WS0010',
+    'Transport',
+    'I2CDevTransport',
+    'I2CBus',
+    'PCF8574Emulator',
+    'WS0010Controller',
+    'Stats',
+    'Histogram',
+    'AsyncWS0010',
+    'Coalescer',
+    'Scheduler',
+    'DisplayGroup',
+    'BusLock',
+    'Bitmap',
+    'BigClock',
+    'Marquee',
     'getAC',
     'dispctl_set',
     'dispctl_get',
@@ -19,12 +47,27 @@ __all__     = [
     'clear_display',
     'ret_home',
     'initialize',
+    'adopt',
+    'check_sync',
+    'resync',
     'poweroff',
     'puts',
     'putline',
     'set_ddram_addr',
     'read_ddram',
     'move_cursor',
-    'shift_display'
+    'shift_display',
+    'fb_write',
+    'fb_clear',
+    'fb_flush',
+    'write_many',
+    'glyph_define',
+    'glyph_load',
+    'deferred',
+    'invalidate',
+    'snapshot',
+    'gfx_begin',
+    'gfx_end',
+    'gfx_flush'
 ]
 
@@ -0,0 +1,146 @@
+"""
+    asyncio front-end of WS0010. Display operations are executed by single
+    worker thread owning the bus, coroutines only queue commands and await
+    their completion, so event loop is never blocked by bus transfers
+    or busy flag waits.
+    Bus system calls and sleeps release GIL, so event loop keeps running
+    while the worker waits for hardware.
+"""
+
+import queue
+import asyncio
+import threading
+from .ws0010 import WS0010
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+QUEUE_SIZE      = 64    # default maximum number of commands queued to worker
+THREAD_NAME     = 'ws0010-io'
+
+# Methods of WS0010 not mirrored as coroutines
+NOT_MIRRORED    = ('deferred',)
+
+# ===========================================================================
+# Asynchronous WS0010 Class
+# ===========================================================================
+
+class AsyncWS0010:
+    """Asynchronous wrapper of WS0010 instance 'lcd'.
+    Public methods of WS0010 are mirrored as coroutines returning
+    the result of the method. Commands are executed in order of calls,
+    when 'queue_size' commands are pending further calls wait for a free
+    slot. A command already queued is executed even if awaiting coroutine
+    is cancelled. Use open() to create WS0010 on worker thread as well,
+    since its constructor initializes the controller."""
+
+    ## Constructor
+    def __init__(self, lcd, queue_size=QUEUE_SIZE):
+        self._lcd = lcd
+        self._queue = queue.Queue()                 # commands for worker thread
+        self._slots = asyncio.Semaphore(queue_size) # free places in command queue
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name=THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    async def open(cls, *args, queue_size=QUEUE_SIZE, **kwargs):
+        """Create WS0010 on worker thread with arguments 'args' and 'kwargs'
+        and return its asynchronous wrapper."""
+
+        alcd = cls(None, queue_size)
+        try:
+            alcd._lcd = await alcd._call(WS0010, *args, **kwargs)
+        except BaseException:
+            await alcd.close()
+            raise
+        return alcd
+
+    @property
+    def lcd(self):
+        """Wrapped WS0010 instance. It must be used on worker thread only, i.e. from run()."""
+
+        return self._lcd
+
+    def _worker(self):
+        """Worker thread: execute queued commands and complete their futures on event loop."""
+
+        while True:
+            (func, args, kwargs, loop, fut) = self._queue.get()
+            res = exc = None
+            if func is not None:
+                try:
+                    res = func(*args, **kwargs)
+                except BaseException as e:
+                    exc = e
+            try:
+                loop.call_soon_threadsafe(self._complete, fut, res, exc)
+            except RuntimeError:
+                # Event loop is closed, nobody waits for result
+                pass
+            if func is None:
+                break
+
+    def _complete(self, fut, res, exc):
+        """Event loop: release queue slot and set result of command future."""
+
+        self._slots.release()
+        if fut.done():
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(res)
+
+    async def _call(self, func, *args, **kwargs):
+        """Queue call of 'func' to worker thread and return its result."""
+
+        if self._closed:
+            raise RuntimeError('Display is closed')
+        await self._slots.acquire()
+        if self._closed:
+            self._slots.release()
+            raise RuntimeError('Display is closed')
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.put((func, args, kwargs, loop, fut))
+        return await fut
+
+    async def run(self, func, *args, **kwargs):
+        """Call 'func(lcd, *args, **kwargs)' on worker thread and return its result.
+        Allows to run several operations as single command, e.g. inside lcd.deferred() block."""
+
+        return await self._call(func, self._lcd, *args, **kwargs)
+
+    async def close(self):
+        """Wait for queued commands to complete and stop worker thread."""
+
+        if self._closed:
+            return
+        await self._slots.acquire()
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.put((None, (), {}, loop, fut))
+        await fut
+        await loop.run_in_executor(None, self._thread.join)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+def _mirror(name):
+    """Make coroutine method calling WS0010 method 'name' on worker thread."""
+
+    async def method(self, *args, **kwargs):
+        return await self._call(getattr(self._lcd, name), *args, **kwargs)
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = getattr(WS0010, name).__doc__
+    return method
+
+for _name in dir(WS0010):
+    if not _name.startswith('_') and _name not in NOT_MIRRORED and callable(getattr(WS0010, _name)):
+        setattr(AsyncWS0010, _name, _mirror(_name))
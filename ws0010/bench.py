@@ -0,0 +1,203 @@
+#! /usr/bin/python3
+"""
+    Benchmark of WS0010 operations on emulated PCF8574/WS0010.
+    Counts I2C transactions, busy flag polls, time spent on emulated I2C bus
+    and elapsed host time per workload.
+    Results can be saved as JSON baseline and compared with later runs.
+
+    Usage: python3 -m ws0010.bench [--buffered] [--timed] [--adaptive] [--rdwr] [--save FILE] [--compare FILE]
+"""
+
+import sys
+import json
+import argparse
+from time import perf_counter
+from .ws0010 import WS0010
+from .emulator import PCF8574Emulator
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+SCREEN_COLS     = 20    # screen width used by workloads
+REPEAT          = 10    # default number of workload repetitions
+METRICS         = ('writes', 'reads', 'bf_polls', 'bus_time', 'time')
+TIME_METRICS    = ('bus_time', 'time')
+
+TEXT_EN = ['Temperature  +21.5C', 'Humidity       45 %', 'Pressure   1013 hPa', 'Wind speed   3 m/s']
+TEXT_RU = ['Температура  +21.5C', 'Влажность      45 %', 'Давление   1013 гПа', 'Скорость ветра 3м/с']
+TEXT_RU_ENCODED = TEXT_RU[0].encode('ws0010-enru')
+
+# ===========================================================================
+# Workloads
+# ===========================================================================
+
+def wl_initialize(lcd):
+    """Initialization sequence."""
+
+    lcd.initialize()
+
+def wl_puts(lcd):
+    """Output of full line from current position."""
+
+    lcd.puts(TEXT_EN[0])
+
+def wl_puts_encoded(lcd):
+    """Output of full line encoded beforehand by font table codec."""
+
+    lcd.puts(TEXT_RU_ENCODED)
+
+def wl_rewrite_en(lcd):
+    """Full-screen rewrite with latin text."""
+
+    for i in range(0, len(TEXT_EN), 2):
+        lcd.putline(TEXT_EN[i], 1)
+        lcd.putline(TEXT_EN[i + 1], 2)
+
+def wl_rewrite_ru(lcd):
+    """Full-screen rewrite with cyrillic text through font table codec."""
+
+    for i in range(0, len(TEXT_RU), 2):
+        lcd.putline(TEXT_RU[i], 1)
+        lcd.putline(TEXT_RU[i + 1], 2)
+
+def wl_clock_tick(lcd):
+    """Clock line update where only last minute digit changes."""
+
+    lcd.putline('17.10.2026 12:34', 1)
+    lcd.putline('17.10.2026 12:35', 1)
+
+def wl_read_ddram(lcd):
+    """Read back of whole DDRAM."""
+
+    lcd.read_ddram(0, 128, cached=False)
+
+def wl_read_line(lcd):
+    """Read back of one visible line."""
+
+    lcd.read_ddram(0, SCREEN_COLS, cached=False)
+
+def wl_snapshot(lcd):
+    """Batched read back of whole DDRAM from controller."""
+
+    lcd.snapshot()
+
+def wl_move_cursor(lcd):
+    """Cursor movement by single steps and by jumps."""
+
+    for count in (1, -1, 5, -5, 17, -17):
+        lcd.move_cursor(count)
+
+def wl_shift_display(lcd):
+    """Display shift by 1000 steps forth and back."""
+
+    lcd.shift_display(1000)
+    lcd.shift_display(-1000)
+
+WORKLOADS = [
+    ('initialize', wl_initialize),
+    ('puts', wl_puts),
+    ('puts_encoded', wl_puts_encoded),
+    ('rewrite_en', wl_rewrite_en),
+    ('rewrite_ru', wl_rewrite_ru),
+    ('clock_tick', wl_clock_tick),
+    ('read_ddram', wl_read_ddram),
+    ('read_line', wl_read_line),
+    ('snapshot', wl_snapshot),
+    ('move_cursor', wl_move_cursor),
+    ('shift_display', wl_shift_display)
+]
+
+# ===========================================================================
+# Benchmark routines
+# ===========================================================================
+
+def make_lcd(transport, **kwargs):
+    """Create and set up display connected to emulator 'transport'."""
+
+    lcd = WS0010(0, 0, transport=transport, **kwargs)
+    lcd.emode_set(increment=True)
+    lcd.dispctl_set(disp_on=True, curs_on=False, blink_on=False)
+    return lcd
+
+def run_workload(func, repeat=REPEAT, rdwr=False, **kwargs):
+    """Run workload 'func' 'repeat' times on fresh emulated display.
+    Return dictionary of metrics per one run."""
+
+    em = PCF8574Emulator(rdwr=rdwr)
+    lcd = make_lcd(em, **kwargs)
+    em.reset_counters()
+    t = perf_counter()
+    for i in range(repeat):
+        func(lcd)
+    t = perf_counter() - t
+    return {
+        'writes': em.writes / repeat,
+        'reads': em.reads / repeat,
+        'bf_polls': em.controller.bf_reads / repeat,
+        'bus_time': em.bus_time / repeat,
+        'time': t / repeat
+    }
+
+def run(repeat=REPEAT, rdwr=False, **kwargs):
+    """Run all workloads. Return dictionary of results keyed by workload name."""
+
+    res = {}
+    for (name, func) in WORKLOADS:
+        res[name] = run_workload(func, repeat, rdwr, **kwargs)
+    return res
+
+def compare(res, base):
+    """Return dictionary of relative changes (in percent) of 'res' against 'base'.
+    Workloads or metrics missing in 'base' are skipped."""
+
+    diff = {}
+    for (name, metrics) in res.items():
+        if name not in base:
+            continue
+        diff[name] = {}
+        for m in METRICS:
+            if m in metrics and m in base[name] and base[name][m]:
+                diff[name][m] = 100 * (metrics[m] - base[name][m]) / base[name][m]
+    return diff
+
+def report(res, diff=None, out=sys.stdout):
+    """Print results table, with relative changes if 'diff' provided."""
+
+    fmt = '{:16s}' + ' {:>16s}' * len(METRICS) + '\n'
+    out.write(fmt.format('workload', 'writes', 'reads', 'bf_polls', 'bus time, ms', 'time, ms'))
+    for (name, metrics) in res.items():
+        cells = []
+        for m in METRICS:
+            v = metrics[m] * 1000 if m in TIME_METRICS else metrics[m]
+            cell = '{:.1f}'.format(v)
+            if diff and name in diff and m in diff[name]:
+                cell += ' ({:+.0f}%)'.format(diff[name][m])
+            cells.append(cell)
+        out.write(fmt.format(name, *cells))
+
+def main(argv=None):
+    """Main program."""
+
+    parser = argparse.ArgumentParser(description='Benchmark WS0010 operations on emulated hardware.')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='repetitions per workload')
+    parser.add_argument('--buffered', action='store_true', help='use buffered (multi-byte write) mode')
+    parser.add_argument('--timed', action='store_true', help='use timed (read-free) write mode')
+    parser.add_argument('--adaptive', action='store_true', help='use adaptive busy flag polling')
+    parser.add_argument('--rdwr', action='store_true', help='emulate combined I2C_RDWR strobed reads')
+    parser.add_argument('--save', metavar='FILE', help='save results as JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare results with JSON baseline')
+    args = parser.parse_args(argv)
+
+    res = run(args.repeat, args.rdwr, buffered=args.buffered, timed=args.timed, adaptive=args.adaptive)
+    diff = None
+    if args.compare:
+        with open(args.compare) as f:
+            diff = compare(res, json.load(f))
+    report(res, diff)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(res, f, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
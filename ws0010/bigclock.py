@@ -0,0 +1,138 @@
+"""
+    Large digit clock for WS0010 graphics mode.
+    Digits are seven-segment glyphs as high as the screen. Every glyph is
+    rendered once to list of pixel columns and cached, a clock tick redraws
+    only digits which changed, and gfx_flush() sends only changed columns.
+"""
+
+from time import time, localtime, strftime
+from .graphics import Bitmap
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+DIGIT_WIDTH     = 14    # pixel columns of digit glyph
+STROKE          = 2     # segment thickness in pixels
+SPACING         = 3     # blank pixel columns between glyphs
+CLOCK_FORMAT    = '%H:%M'
+
+# Lit segments of digits: top, top right, bottom right, bottom, bottom left, top left, middle
+SEGMENTS = {
+    '0': 'abcdef', '1': 'bc', '2': 'abdeg', '3': 'abcdg', '4': 'bcfg',
+    '5': 'acdfg', '6': 'acdefg', '7': 'abc', '8': 'abcdefg', '9': 'abcdfg',
+    '-': 'g', ' ': '' }
+
+# ===========================================================================
+# Glyph rendering
+# ===========================================================================
+
+_glyph_cache = {}   # glyph columns by (char, width, height, stroke)
+
+def _render(char, width, height, stroke):
+    """Render glyph of 'char' to Bitmap."""
+
+    if char == ':':
+        bm = Bitmap(stroke, height, use_numpy=False)
+        for y in (height // 4, height * 3 // 4):
+            bm.fill_rect(0, y - stroke // 2, stroke, stroke)
+        return bm
+    bm = Bitmap(width, height, use_numpy=False)
+    mid = height // 2 - stroke // 2
+    right = width - stroke
+    rects = {
+        'a': (0, 0, width, stroke),
+        'b': (right, 0, stroke, mid + stroke),
+        'c': (right, mid, stroke, height - mid),
+        'd': (0, height - stroke, width, stroke),
+        'e': (0, mid, stroke, height - mid),
+        'f': (0, 0, stroke, mid + stroke),
+        'g': (0, mid, width, stroke)}
+    for seg in SEGMENTS[char]:
+        bm.fill_rect(*rects[seg])
+    return bm
+
+def glyph(char, width=DIGIT_WIDTH, height=16, stroke=STROKE):
+    """Return cached list of pixel columns (integers, top pixel in bit 0) of 'char' glyph."""
+
+    key = (char, width, height, stroke)
+    columns = _glyph_cache.get(key)
+    if columns is None:
+        bm = _render(char, width, height, stroke)
+        columns = _glyph_cache[key] = [bm.column(x) for x in range(bm.width)]
+    return columns
+
+# ===========================================================================
+# Big clock Class
+# ===========================================================================
+
+class BigClock:
+    """Clock drawn by large digits on WS0010 instance 'lcd' in graphics mode.
+    Text of 'fmt' (strftime format of digits, spaces, '-' and ':')
+    is centered on the screen unless left column 'x' is given."""
+
+    ## Constructor
+    def __init__(self, lcd, fmt=CLOCK_FORMAT, x=None, width=DIGIT_WIDTH, stroke=STROKE, spacing=SPACING):
+        self._lcd = lcd
+        self._fmt = fmt
+        self._x = x
+        self._width = width
+        self._stroke = stroke
+        self._spacing = spacing
+        self._shown = None      # text on the screen, None if nothing drawn yet
+        self._layout = None     # left columns of text characters
+
+    def _glyph(self, char):
+        """Return columns of 'char' glyph for this clock."""
+
+        return glyph(char, self._width, self._lcd.gfx.height, self._stroke)
+
+    def _place(self, text):
+        """Compute left columns of characters of 'text'."""
+
+        widths = [len(self._glyph(c)) for c in text]
+        total = sum(widths) + self._spacing * (len(text) - 1)
+        x = self._x if self._x is not None else (self._lcd.gfx.width - total) // 2
+        self._layout = []
+        for w in widths:
+            self._layout.append(x)
+            x += w + self._spacing
+
+    def _draw(self, x, columns):
+        """Copy glyph 'columns' to bitmap at column 'x'."""
+
+        gfx = self._lcd.gfx
+        for (i, v) in enumerate(columns):
+            if 0 <= x + i < gfx.width:
+                gfx.set_column(x + i, v)
+
+    def show(self, t=None):
+        """Display time 't' (current time if not given).
+        Return number of redrawn characters."""
+
+        lcd = self._lcd
+        if not lcd.gcmpwr_get()[0]:
+            # Graphics RAM is resent as a whole, glyphs are redrawn if bitmap was replaced
+            gfx = lcd.gfx
+            lcd.gfx_begin()
+            if lcd.gfx is not gfx:
+                self._shown = None
+        text = strftime(self._fmt, localtime(time() if t is None else t))
+        if self._shown is None or len(text) != len(self._shown):
+            lcd.gfx.clear()
+            self._place(text)
+            self._shown = None
+        count = 0
+        for (i, char) in enumerate(text):
+            if self._shown is not None and self._shown[i] == char:
+                continue
+            self._draw(self._layout[i], self._glyph(char))
+            count += 1
+        self._shown = text
+        lcd.gfx_flush()
+        return count
+
+    def invalidate(self):
+        """Make the next show() redraw all characters."""
+
+        self._shown = None
@@ -0,0 +1,242 @@
+"""
+    Coalescing of text updates in front of WS0010.
+    Producers put text to lines or regions at any rate, only the newest
+    pending content of every character cell is kept. Pending lines are
+    sent oldest first within a token bucket budget of bus bytes or bus
+    transactions per second, so latency of the newest value stays bounded
+    instead of growing with backlog of superseded frames.
+"""
+
+import threading
+from time import perf_counter
+from .ws0010 import DDRAM_ADDR, DDRAM_SIZE, COST_BYTE, COST_BF
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+BUDGET_BYTES        = 'bytes'           # budget counts port bytes transferred on bus
+BUDGET_TRANSACTIONS = 'transactions'    # budget counts I2C transactions
+
+THREAD_NAME         = 'ws0010-coalesce'
+
+# ===========================================================================
+# Coalescer Class
+# ===========================================================================
+
+class Coalescer:
+    """Latest-wins update queue for WS0010 instance 'lcd'.
+    'rate' is budget in 'unit's per second (None for unlimited), 'burst'
+    is size of token bucket (equal to 'rate' if not set). An update costing
+    more than the whole bucket is sent when the bucket is full.
+    Pending updates are sent either by pump() calls or by worker thread
+    started with start(), not both."""
+
+    ## Constructor
+    def __init__(self, lcd, rate=None, unit=BUDGET_BYTES, burst=None, clock=perf_counter):
+        if unit not in (BUDGET_BYTES, BUDGET_TRANSACTIONS):
+            raise ValueError('Unknown budget unit: {}'.format(unit))
+        self._lcd = lcd
+        self._rate = rate       # budget units per second, None if unlimited
+        self._unit = unit
+        self._burst = burst if burst is not None else rate
+        self._tokens = self._burst
+        self._clock = clock
+        self._stamp = clock()   # time of last token bucket refill
+        self._pending = {}      # pending cells {addr: symbol} by line, oldest line first
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.superseded = 0     # pending characters replaced by newer ones before sending
+        self.sent = 0           # lines sent
+
+    def write(self, line, col, string):
+        """Put a 'string' (str or pre-encoded bytes-like object) to 'line' at column 'col'.
+        Pending content of the same cells is replaced. Text is encoded when
+        it is sent, so CGRAM slots of custom glyphs are assigned by the sender."""
+
+        line = (line - 1) % 2 + 1
+        addr = DDRAM_ADDR[line - 1] + max(col, 0)
+        if not isinstance(string, str):
+            string = bytes(string)
+        symbols = string[:max(DDRAM_SIZE - addr, 0)]
+        if not symbols:
+            return
+        with self._cond:
+            cells = self._pending.setdefault(line, {})
+            for symbol in symbols:
+                if addr in cells:
+                    self.superseded += 1
+                cells[addr] = symbol
+                addr += 1
+            self._cond.notify()
+
+    def putline(self, string, line):
+        """Put a 'string' to specified 'line' as WS0010.putline() does."""
+
+        self.write(line, 0, string)
+
+    def pending(self):
+        """Return number of lines with pending updates."""
+
+        with self._cond:
+            return len(self._pending)
+
+    @staticmethod
+    def _fields(line, cells):
+        """Return (line, col, string) fields of contiguous runs of pending 'cells'.
+        Cells hold characters (str) or pre-encoded symbols (int), runs are split
+        where the kind changes."""
+
+        def run(start, end):
+            values = [cells[a] for a in range(start, end)]
+            return (line, start - base, ''.join(values) if isinstance(values[0], str) else bytes(values))
+
+        fields = []
+        if not cells:
+            return fields
+        base = DDRAM_ADDR[line - 1]
+        start = None
+        for addr in sorted(cells):
+            if start is not None and addr == end and isinstance(cells[addr], str) == isinstance(cells[start], str):
+                end += 1
+                continue
+            if start is not None:
+                fields.append(run(start, end))
+            start = addr
+            end = addr + 1
+        fields.append(run(start, end))
+        return fields
+
+    def _cost(self, fields):
+        """Return estimated budget cost of sending 'fields'.
+        Every field takes Set DDRAM Address instruction and its symbols,
+        BF is checked after each byte, or once per run in buffered mode."""
+
+        lcd = self._lcd
+        size = sum(len(symbols) + 1 for (line, col, symbols) in fields)
+        checks = 2 * len(fields) if lcd._buffered else size
+        if lcd._timed:
+            bf = 0
+        elif self._unit == BUDGET_BYTES or not lcd._device.combined_reads:
+            bf = COST_BF
+        else:
+            bf = 1
+        if self._unit == BUDGET_TRANSACTIONS and lcd._buffered:
+            # Every BF check (or execution time wait) sends the buffer by one write
+            return checks * (1 + bf)
+        return size * COST_BYTE + checks * bf
+
+    def _refill(self):
+        """Add tokens earned since the last refill."""
+
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def _head(self):
+        """Return (line, fields, cost) of the oldest pending line or None."""
+
+        if not self._pending:
+            return None
+        line = next(iter(self._pending))
+        fields = self._fields(line, self._pending[line])
+        return (line, fields, self._cost(fields) if self._rate is not None else 0)
+
+    def _take(self, force=False):
+        """Remove the oldest pending line and charge its cost if budget allows
+        or 'force' is set. Return its fields or None."""
+
+        head = self._head()
+        if head is None:
+            return None
+        (line, fields, cost) = head
+        if self._rate is not None:
+            self._refill()
+            if not force and cost > self._tokens and self._tokens < self._burst:
+                return None
+            self._tokens -= cost
+        del self._pending[line]
+        return fields
+
+    def _delay(self):
+        """Return time until the oldest pending line fits in budget, None if nothing pending."""
+
+        head = self._head()
+        if head is None:
+            return None
+        if self._rate is None:
+            return 0
+        self._refill()
+        need = min(head[2], self._burst) - self._tokens
+        return max(need / self._rate, 0) if self._rate else None
+
+    def _send(self, fields):
+        """Send fields of one line to display."""
+
+        self._lcd.write_many(fields)
+        self.sent += 1
+
+    def pump(self):
+        """Send pending lines allowed by budget. Return number of lines sent."""
+
+        count = 0
+        while True:
+            with self._cond:
+                fields = self._take()
+            if fields is None:
+                return count
+            self._send(fields)
+            count += 1
+
+    def flush(self):
+        """Send all pending lines regardless of budget (their cost is still charged)."""
+
+        while True:
+            with self._cond:
+                fields = self._take(force=True)
+            if fields is None:
+                return
+            self._send(fields)
+
+    def wait_time(self):
+        """Return time until the next pending line can be sent by pump(), None if nothing pending."""
+
+        with self._cond:
+            return self._delay()
+
+    def _run(self):
+        """Worker thread: send pending lines as budget allows."""
+
+        while True:
+            with self._cond:
+                while self._running:
+                    delay = self._delay()
+                    if delay == 0:
+                        break
+                    self._cond.wait(delay)
+                if not self._running:
+                    return
+                fields = self._take()
+            if fields is not None:
+                self._send(fields)
+
+    def start(self):
+        """Start worker thread sending pending lines."""
+
+        if self._thread is not None:
+            raise RuntimeError('Coalescer already started')
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop worker thread. Pending lines are kept, flush() sends them."""
+
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,111 @@
+"""
+    Text codecs for WS0010 character font tables.
+    Each font table selected by Function Set FT bits has its own codec
+    registered in Python codec registry, so a whole string is converted
+    to controller symbols at once: str.encode('ws0010-enru').
+    Characters missing in a table are passed as their code modulo 256,
+    as the library always did, when error handler ERRORS_MASK is used.
+"""
+
+import codecs
+
+# ===========================================================================
+# Codec names
+# ===========================================================================
+
+CODEC_ENJP      = 'ws0010_enjp'     # english-japanese font table
+CODEC_ENRU      = 'ws0010_enru'     # english-russian font table
+
+ERRORS_MASK     = 'ws0010_mask'     # error handler passing unknown characters as code modulo 256
+
+# ===========================================================================
+# Translation table for russian letters
+# ===========================================================================
+
+TRANSLATE_RU = {
+    'А': 0x41, 'Б': 0xA0, 'В': 0x42, 'Г': 0xA1, 'Д': 0xE0, 'Е': 0x45, 'Ж': 0xA3, 'З': 0xA4,
+    'И': 0xA5, 'Й': 0xA6, 'К': 0x4B, 'Л': 0xA7, 'М': 0x4D, 'Н': 0x48, 'О': 0x4F, 'П': 0xA8,
+    'Р': 0x50, 'С': 0x43, 'Т': 0x54, 'У': 0xA9, 'Ф': 0xAA, 'Х': 0x58, 'Ц': 0xE1, 'Ч': 0xAB,
+    'Ш': 0xAC, 'Щ': 0xE2, 'Ъ': 0xAD, 'Ы': 0xAE, 'Ь': 0x62, 'Э': 0xAF, 'Ю': 0xB0, 'Я': 0xB1,
+    'Ё': 0xA2, 'ё': 0xB5,
+    'а': 0x61, 'б': 0xB2, 'в': 0xB3, 'г': 0xB4, 'д': 0xE3, 'е': 0x65, 'ж': 0xB6, 'з': 0xB7,
+    'и': 0xB8, 'й': 0xB9, 'к': 0xBA, 'л': 0xBB, 'м': 0xBC, 'н': 0xBD, 'о': 0x6F, 'п': 0xBE,
+    'р': 0x70, 'с': 0x63, 'т': 0xBF, 'у': 0x79, 'ф': 0xE4, 'х': 0x78, 'ц': 0xE5, 'ч': 0xC0,
+    'ш': 0xC1, 'щ': 0xE6, 'ъ': 0xC2, 'ы': 0xC3, 'ь': 0xC4, 'э': 0xC5, 'ю': 0xC6, 'я': 0xC7 }
+
+UNTRANSLATE_RU = {v: k for k, v in TRANSLATE_RU.items()}
+
+# ===========================================================================
+# Translation table for english-japanese font table
+# Lower half is ASCII except for yen sign and arrows, upper half holds
+# half-width katakana in JIS X 0201 order and some greek and math symbols
+# ===========================================================================
+
+TRANSLATE_JP = {
+    '¥': 0x5C, '→': 0x7E, '←': 0x7F,
+    'α': 0xE0, 'ä': 0xE1, 'β': 0xE2, 'ε': 0xE3, 'μ': 0xE4, 'σ': 0xE5, 'ρ': 0xE6, '√': 0xE8,
+    '¢': 0xEC, '£': 0xED, 'ñ': 0xEE, 'ö': 0xEF, 'θ': 0xF2, '∞': 0xF3, 'Ω': 0xF4, 'ü': 0xF5,
+    'Σ': 0xF6, 'π': 0xF7, '÷': 0xFD, '█': 0xFF }
+TRANSLATE_JP.update((chr(0xFF61 + i), 0xA1 + i) for i in range(0xDF - 0xA1 + 1))
+
+UNTRANSLATE_JP = {v: k for k, v in TRANSLATE_JP.items()}
+
+# ===========================================================================
+# Codec tables
+# Encoding table maps characters to controller symbols, decoding table maps
+# symbols to characters, symbols missing there are decoded as latin-1.
+# Western europe font tables have no codecs until their tables are added.
+# ===========================================================================
+
+CODEC_TABLES = {
+    CODEC_ENJP: (TRANSLATE_JP, {k: v for k, v in UNTRANSLATE_JP.items() if k in (0x5C, 0x7E, 0x7F) or k >= 0x80}),
+    # Lower half codes shared by russian and latin letters are decoded as russian, as the library always did
+    CODEC_ENRU: (TRANSLATE_RU, UNTRANSLATE_RU)
+}
+
+# ===========================================================================
+# Codec functions
+# ===========================================================================
+
+def _mask_errors(exc):
+    """Error handler replacing characters not encodable to symbol by their code modulo 256."""
+
+    if not isinstance(exc, UnicodeEncodeError):
+        raise exc
+    return (''.join(chr(ord(c) & 0xFF) for c in exc.object[exc.start:exc.end]), exc.end)
+
+def _make_codec(name, encode_table, decode_table):
+    """Build CodecInfo for font table codec 'name'.
+    Translation tables are precompiled to str.translate() form, so both
+    directions are done by translate() and latin-1 codec at C speed."""
+
+    enc = {ord(k): chr(v) for (k, v) in encode_table.items()}
+    dec = dict(decode_table)
+
+    def encode(string, errors='strict'):
+        return (string.translate(enc).encode('latin-1', errors), len(string))
+
+    def decode(data, errors='strict'):
+        data = bytes(data)
+        return (data.decode('latin-1', errors).translate(dec), len(data))
+
+    class IncrementalEncoder(codecs.IncrementalEncoder):
+        def encode(self, string, final=False):
+            return encode(string, self.errors)[0]
+
+    class IncrementalDecoder(codecs.IncrementalDecoder):
+        def decode(self, data, final=False):
+            return decode(data, self.errors)[0]
+
+    return codecs.CodecInfo(encode, decode, name=name,
+        incrementalencoder=IncrementalEncoder, incrementaldecoder=IncrementalDecoder)
+
+CODECS = {name: _make_codec(name, *tables) for (name, tables) in CODEC_TABLES.items()}
+
+def _search(name):
+    """Codec search function for codec registry."""
+
+    return CODECS.get(name.replace('-', '_'))
+
+codecs.register(_search)
+codecs.register_error(ERRORS_MASK, _mask_errors)
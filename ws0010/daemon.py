@@ -0,0 +1,441 @@
+#! /usr/bin/python3
+"""
+    Resident display daemon. The daemon owns the panel (initializes it once)
+    and serves clients over Unix domain socket with compact binary protocol,
+    so producers start without initialization and do not clear the screen.
+    Requests of all clients are executed in order of arrival by single loop,
+    region writes arrived together are merged into one batch.
+
+    Request:  header (opcode, flags, payload length) + payload
+    Reply:    header (status, payload length) + payload
+
+    Usage: python3 -m ws0010.daemon [--address ADDR] [--bus N] [--socket PATH] [--buffered] [--timed]
+"""
+
+import os
+import sys
+import socket
+import struct
+import argparse
+import selectors
+from .ws0010 import (WS0010, BACKEND_I2CDEV, BACKEND_RDWR,
+    PMASK_DISP_ON, PMASK_CURS_ON, PMASK_BLINK_ON, PMASK_INC, PMASK_DISP_SHIFT_EN,
+    PMASK_GRAPHICS_MODE, PMASK_PWR_ON)
+
+# ===========================================================================
+# Protocol
+# ===========================================================================
+
+SOCKET_PATH     = '/run/ws0010.sock'    # default socket path
+
+REQ_HEADER      = struct.Struct('<BBH')     # opcode, flags, payload length
+REPLY_HEADER    = struct.Struct('<BH')      # status, payload length
+WRITE           = struct.Struct('<BB')      # line, column; followed by symbols or text
+CTL             = struct.Struct('<BBBh')    # control code, property bits, mask of changed bits, argument
+READ            = struct.Struct('<BB')      # DDRAM address, size
+
+OP_WRITE        = 0x01  # write region: WRITE + data
+OP_PUTLINE      = 0x02  # output line: WRITE (column ignored) + data
+OP_CTL          = 0x03  # control: CTL
+OP_SNAPSHOT     = 0x04  # return DDRAM contents
+OP_READ         = 0x05  # return text read from DDRAM: READ
+
+FLAG_TEXT       = 0x01  # data is UTF-8 text to be encoded by daemon (raw controller symbols otherwise)
+FLAG_NOREPLY    = 0x02  # no reply is sent
+FLAG_FRESH      = 0x04  # snapshot is read from controller instead of host copy
+
+CTL_DISPCTL     = 0x01  # Display ON/OFF Control: PMASK_DISP_ON, PMASK_CURS_ON, PMASK_BLINK_ON bits
+CTL_EMODE       = 0x02  # Entry Mode: PMASK_INC, PMASK_DISP_SHIFT_EN bits
+CTL_GCMPWR      = 0x03  # GC Mode/Internal Power: PMASK_GRAPHICS_MODE, PMASK_PWR_ON bits
+CTL_CLEAR       = 0x04  # Clear Display
+CTL_HOME        = 0x05  # Return Home
+CTL_SHIFT       = 0x06  # shift display by argument steps
+CTL_CURSOR      = 0x07  # move cursor by argument steps
+CTL_ADDR        = 0x08  # set DDRAM address to argument
+
+ST_OK           = 0x00  # request done, payload is result
+ST_ERROR        = 0x01  # request failed, payload is UTF-8 error message
+
+RECV_SIZE       = 65536   # maximum bytes received from client at once
+SELECT_TIMEOUT  = 1.0     # period of checking for stop request, in seconds
+
+# ===========================================================================
+# Daemon
+# ===========================================================================
+
+class _Conn:
+    """Client connection state."""
+
+    ## Constructor
+    def __init__(self, sock):
+        self.sock = sock
+        self.rbuf = bytearray()     # received bytes not parsed yet
+        self.wbuf = bytearray()     # reply bytes not sent yet
+
+class Daemon:
+    """Daemon serving WS0010 instance 'lcd' on Unix domain socket 'path'."""
+
+    ## Constructor
+    def __init__(self, lcd, path=SOCKET_PATH):
+        self._lcd = lcd
+        self._path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self._listener, selectors.EVENT_READ)
+        self._running = False
+
+    def close(self):
+        """Close all connections and remove socket."""
+
+        for key in list(self._sel.get_map().values()):
+            self._sel.unregister(key.fileobj)
+            key.fileobj.close()
+        self._sel.close()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+    def _accept(self):
+        """Accept new client connection."""
+
+        (sock, addr) = self._listener.accept()
+        sock.setblocking(False)
+        self._sel.register(sock, selectors.EVENT_READ, _Conn(sock))
+
+    def _drop(self, conn):
+        """Close client connection."""
+
+        self._sel.unregister(conn.sock)
+        conn.sock.close()
+
+    def _receive(self, conn, requests):
+        """Read data from client, append complete requests to 'requests'."""
+
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(conn)
+            return
+        conn.rbuf += data
+        while len(conn.rbuf) >= REQ_HEADER.size:
+            (opcode, flags, size) = REQ_HEADER.unpack_from(conn.rbuf)
+            end = REQ_HEADER.size + size
+            if len(conn.rbuf) < end:
+                break
+            requests.append((conn, opcode, flags, bytes(conn.rbuf[REQ_HEADER.size:end])))
+            del conn.rbuf[:end]
+
+    def _reply(self, conn, status, payload=b''):
+        """Send reply to client, the rest is sent when socket is writable."""
+
+        if conn.sock.fileno() < 0:
+            return
+        conn.wbuf += REPLY_HEADER.pack(status, len(payload)) + payload
+        self._send(conn)
+
+    def _send(self, conn):
+        """Send pending reply bytes to client."""
+
+        try:
+            n = conn.sock.send(conn.wbuf)
+        except (BlockingIOError, InterruptedError):
+            n = 0
+        except OSError:
+            self._drop(conn)
+            return
+        del conn.wbuf[:n]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.wbuf else 0)
+        self._sel.modify(conn.sock, events, conn)
+
+    def _field(self, flags, payload):
+        """Return (line, col, data) of write request."""
+
+        (line, col) = WRITE.unpack_from(payload)
+        data = payload[WRITE.size:]
+        if flags & FLAG_TEXT:
+            data = data.decode('utf-8')
+        return (line, col, data)
+
+    def _ctl(self, payload):
+        """Execute control request."""
+
+        (code, bits, mask, arg) = CTL.unpack(payload)
+
+        def prop(m):
+            return bool(bits & m) if mask & m else None
+
+        lcd = self._lcd
+        if code == CTL_DISPCTL:
+            lcd.dispctl_set(prop(PMASK_DISP_ON), prop(PMASK_CURS_ON), prop(PMASK_BLINK_ON))
+        elif code == CTL_EMODE:
+            lcd.emode_set(prop(PMASK_INC), prop(PMASK_DISP_SHIFT_EN))
+        elif code == CTL_GCMPWR:
+            lcd.gcmpwr_set(prop(PMASK_GRAPHICS_MODE), prop(PMASK_PWR_ON))
+        elif code == CTL_CLEAR:
+            lcd.clear_display()
+        elif code == CTL_HOME:
+            lcd.ret_home()
+        elif code == CTL_SHIFT:
+            lcd.shift_display(arg)
+        elif code == CTL_CURSOR:
+            lcd.move_cursor(arg)
+        elif code == CTL_ADDR:
+            lcd.set_ddram_addr(arg)
+        else:
+            raise ValueError('Unknown control code: {}'.format(code))
+
+    def _execute(self, opcode, flags, payload):
+        """Execute single request, return reply payload."""
+
+        lcd = self._lcd
+        if opcode == OP_PUTLINE:
+            (line, col, data) = self._field(flags, payload)
+            lcd.putline(data, line)
+        elif opcode == OP_CTL:
+            self._ctl(payload)
+        elif opcode == OP_SNAPSHOT:
+            return lcd.snapshot(cached=not flags & FLAG_FRESH)
+        elif opcode == OP_READ:
+            (ac, size) = READ.unpack(payload)
+            return lcd.read_ddram(ac, size).encode('utf-8')
+        else:
+            raise ValueError('Unknown opcode: {}'.format(opcode))
+        return b''
+
+    def _process(self, requests):
+        """Execute requests in order of arrival.
+        Runs of region writes are sent as one write_many() batch."""
+
+        batch = []      # (conn, flags) of batched writes
+        fields = []
+        for (conn, opcode, flags, payload) in requests + [(None, None, 0, b'')]:
+            if opcode == OP_WRITE:
+                try:
+                    fields.append(self._field(flags, payload))
+                    batch.append((conn, flags))
+                except (struct.error, UnicodeDecodeError) as e:
+                    if not flags & FLAG_NOREPLY:
+                        self._reply(conn, ST_ERROR, str(e).encode('utf-8'))
+                continue
+            if batch:
+                (status, res) = (ST_OK, b'')
+                try:
+                    self._lcd.write_many(fields)
+                except Exception as e:
+                    (status, res) = (ST_ERROR, str(e).encode('utf-8'))
+                for (c, f) in batch:
+                    if not f & FLAG_NOREPLY:
+                        self._reply(c, status, res)
+                batch = []
+                fields = []
+            if conn is None:
+                break
+            try:
+                (status, res) = (ST_OK, self._execute(opcode, flags, payload))
+            except Exception as e:
+                (status, res) = (ST_ERROR, str(e).encode('utf-8'))
+            if not flags & FLAG_NOREPLY:
+                self._reply(conn, status, res)
+
+    def serve_forever(self):
+        """Serve clients until stop() is called."""
+
+        self._running = True
+        while self._running:
+            requests = []
+            for (key, events) in self._sel.select(SELECT_TIMEOUT):
+                if key.data is None:
+                    self._accept()
+                    continue
+                conn = key.data
+                if events & selectors.EVENT_WRITE:
+                    self._send(conn)
+                if events & selectors.EVENT_READ and conn.sock.fileno() >= 0:
+                    self._receive(conn, requests)
+            # Requests of connections dropped meanwhile are still executed, their replies are lost
+            requests = [r for r in requests if r[0].sock.fileno() >= 0 or r[2] & FLAG_NOREPLY]
+            self._process(requests)
+
+    def stop(self):
+        """Make serve_forever() return after current loop iteration."""
+
+        self._running = False
+
+# ===========================================================================
+# Client
+# ===========================================================================
+
+class Client:
+    """Client of display daemon on Unix domain socket 'path'.
+    Writes are not waited for unless 'wait' is True: requests are
+    executed in order, so any later waited request implies their completion."""
+
+    ## Constructor
+    def __init__(self, path=SOCKET_PATH):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+
+    def close(self):
+        """Close connection to daemon."""
+
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _recv(self, size):
+        """Receive exactly 'size' bytes."""
+
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('Connection closed by daemon')
+            data += chunk
+        return bytes(data)
+
+    def _request(self, opcode, payload=b'', flags=0):
+        """Send request and return reply payload unless FLAG_NOREPLY is set."""
+
+        self._sock.sendall(REQ_HEADER.pack(opcode, flags, len(payload)) + payload)
+        if flags & FLAG_NOREPLY:
+            return None
+        (status, size) = REPLY_HEADER.unpack(self._recv(REPLY_HEADER.size))
+        payload = self._recv(size)
+        if status != ST_OK:
+            raise RuntimeError(payload.decode('utf-8', 'replace'))
+        return payload
+
+    @staticmethod
+    def _data(string):
+        """Return (flags, data) for 'string': str is sent as text, bytes-like as symbols."""
+
+        if isinstance(string, str):
+            return (FLAG_TEXT, string.encode('utf-8'))
+        return (0, bytes(string))
+
+    def write(self, line, col, string, wait=False):
+        """Output a 'string' (str or bytes-like of controller symbols) to 'line' at column 'col'."""
+
+        (flags, data) = self._data(string)
+        if not wait:
+            flags |= FLAG_NOREPLY
+        self._request(OP_WRITE, WRITE.pack(line, col) + data, flags)
+
+    def putline(self, string, line, wait=False):
+        """Output a 'string' to specified 'line' of screen."""
+
+        (flags, data) = self._data(string)
+        if not wait:
+            flags |= FLAG_NOREPLY
+        self._request(OP_PUTLINE, WRITE.pack(line, 0) + data, flags)
+
+    def _ctl(self, code, props=(), arg=0):
+        """Send control request with (value, mask) properties 'props'."""
+
+        bits = mask = 0
+        for (value, m) in props:
+            if value in (True, False):
+                mask |= m
+                if value:
+                    bits |= m
+        self._request(OP_CTL, CTL.pack(code, bits, mask, arg))
+
+    def dispctl_set(self, disp_on=None, curs_on=None, blink_on=None):
+        """Set Display ON/OFF Control properties as WS0010.dispctl_set() does."""
+
+        self._ctl(CTL_DISPCTL, ((disp_on, PMASK_DISP_ON), (curs_on, PMASK_CURS_ON), (blink_on, PMASK_BLINK_ON)))
+
+    def emode_set(self, increment=None, display_shift=None):
+        """Set Entry Mode properties as WS0010.emode_set() does."""
+
+        self._ctl(CTL_EMODE, ((increment, PMASK_INC), (display_shift, PMASK_DISP_SHIFT_EN)))
+
+    def gcmpwr_set(self, graphics_mode=None, intpwr=None):
+        """Set GC Mode/Internal Power properties as WS0010.gcmpwr_set() does."""
+
+        self._ctl(CTL_GCMPWR, ((graphics_mode, PMASK_GRAPHICS_MODE), (intpwr, PMASK_PWR_ON)))
+
+    def clear_display(self):
+        """Clear display."""
+
+        self._ctl(CTL_CLEAR)
+
+    def ret_home(self):
+        """Return home."""
+
+        self._ctl(CTL_HOME)
+
+    def shift_display(self, count=1):
+        """Shift display by 'count' steps."""
+
+        self._ctl(CTL_SHIFT, arg=count)
+
+    def move_cursor(self, count=1):
+        """Move cursor by 'count' steps."""
+
+        self._ctl(CTL_CURSOR, arg=count)
+
+    def set_ddram_addr(self, ac=0):
+        """Set DDRAM address."""
+
+        self._ctl(CTL_ADDR, arg=ac)
+
+    def snapshot(self, cached=True):
+        """Return DDRAM contents as bytes. Host copy of daemon is returned
+        if it is trusted and 'cached' is True."""
+
+        return self._request(OP_SNAPSHOT, flags=0 if cached else FLAG_FRESH)
+
+    def read_ddram(self, ac=0, size=1):
+        """Read 'size' bytes of data from 'ac' position as text."""
+
+        return self._request(OP_READ, READ.pack(max(min(ac, 0xFF), 0), max(min(size, 0xFF), 0))).decode('utf-8')
+
+# ===========================================================================
+# Main program
+# ===========================================================================
+
+def main(argv=None):
+    """Main program."""
+
+    parser = argparse.ArgumentParser(description='WS0010 display daemon.')
+    parser.add_argument('--address', type=lambda s: int(s, 0), default=0x39, help='I2C address of PCF8574')
+    parser.add_argument('--bus', type=int, default=0, help='I2C bus number')
+    parser.add_argument('--lines', type=int, default=2, help='lines of screen')
+    parser.add_argument('--backend', choices=(BACKEND_I2CDEV, BACKEND_RDWR), default=BACKEND_I2CDEV,
+        help='bus backend')
+    parser.add_argument('--socket', default=SOCKET_PATH, help='Unix domain socket path')
+    parser.add_argument('--mode', type=lambda s: int(s, 8), default=0o660, help='socket file permissions (octal)')
+    parser.add_argument('--buffered', action='store_true', help='use buffered (multi-byte write) mode')
+    parser.add_argument('--timed', action='store_true', help='use timed (read-free) write mode')
+    parser.add_argument('--adaptive', action='store_true', help='use adaptive busy flag polling')
+    parser.add_argument('--framebuffer', action='store_true', help='send only changed characters')
+    args = parser.parse_args(argv)
+
+    lcd = WS0010(args.address, args.bus, lines=args.lines, backend=args.backend, buffered=args.buffered,
+        timed=args.timed, adaptive=args.adaptive, framebuffer=args.framebuffer)
+    lcd.emode_set(increment=True)
+    lcd.dispctl_set(disp_on=True, curs_on=False, blink_on=False)
+    daemon = Daemon(lcd, args.socket)
+    os.chmod(args.socket, args.mode)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""
+    Software emulator of PCF8574 I/O expander with WS0010 controller
+    wired to it in 4-bit mode. Allows to run and profile the library
+    without real hardware.
+"""
+
+from time import perf_counter
+from .transport import Transport
+from .ws0010 import (PIN_RS, PIN_RW, PIN_EN, PIN_DATA, RMASK_BF,
+    IMASK_CLR_DISP, IMASK_RET_HOME, IMASK_ENTRY_MODE, PMASK_INC, PMASK_DISP_SHIFT_EN,
+    IMASK_DISP_CTL, PMASK_DISP_ON, PMASK_CURS_ON, PMASK_BLINK_ON,
+    IMASK_CURS_DISP_SHIFT, PMASK_DISP_SHIFT, PMASK_SHIFT_MOVE_RIGHT,
+    IMASK_GCMODE_PWR, PMASK_GRAPHICS_MODE, PMASK_PWR_ON,
+    IMASK_FUNC, PMASK_8BIT_MODE, PMASK_LINES,
+    IMASK_CGRAM_ADDR, IMASK_DDRAM_ADDR,
+    DDRAM_SIZE, CGRAM_SIZE, EXEC_TIME, EXEC_TIME_SLOW)
+from .graphics import GRAPHICS_WIDTH, PAGE_HEIGHT
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+BUS_SPEED       = 100000    # emulated I2C bus clock, Hz
+BUS_BYTE_BITS   = 9         # bits on bus per transferred byte (8 data + ACK)
+SYNC_NIBBLES    = 5         # consecutive zero instruction nibbles which reset interface to 8-bit mode
+BLANK           = 0x20      # DDRAM fill value
+GDRAM_WIDTH     = 128       # addressable columns of graphics RAM page
+GDRAM_PAGES     = 2         # pages of graphics RAM
+
+# ===========================================================================
+# WS0010 controller model
+# ===========================================================================
+
+class WS0010Controller:
+
+    ## Constructor
+    def __init__(self):
+        self.ddram = bytearray([BLANK] * DDRAM_SIZE)
+        self.cgram = bytearray(CGRAM_SIZE)
+        self.gdram = bytearray(GDRAM_PAGES * GDRAM_WIDTH)
+        self.busy_until = 0.0       # time when current instruction completes
+        self.violations = 0         # nibbles written while controller was busy
+        self.bf_reads = 0           # busy flag reads
+        self.power_on()
+
+    def power_on(self):
+        """Reset controller to power-on state. RAM contents are kept."""
+
+        self.eight_bit = True       # interface data length
+        self.pending = None         # high nibble received in 4-bit mode
+        self.zero_nibbles = 0       # consecutive zero instruction nibbles
+        self.read_nibble = 0        # next nibble index of 4-bit read
+        self.lines = 1
+        self.font = 0
+        self.ac = 0                 # address counter
+        self.cgram_mode = False     # AC addresses CGRAM (True) or DDRAM (False)
+        self.increment = True
+        self.display_shift = False
+        self.disp_on = False
+        self.curs_on = False
+        self.blink_on = False
+        self.graphics_mode = False
+        self.intpwr = False
+        self.shift = 0              # DDRAM column shown in the leftmost screen position
+        self.gx = 0                 # graphics RAM column
+        self.gpage = 0              # graphics RAM page
+
+    def busy(self, now):
+        """Return True if controller is executing instruction at time 'now'."""
+
+        return now < self.busy_until
+
+    def line_width(self):
+        """Return DDRAM width of one display line."""
+
+        return DDRAM_SIZE // self.lines
+
+    def _advance_ac(self, shift_display):
+        """Move AC according to entry mode, shift display if requested."""
+
+        step = 1 if self.increment else -1
+        size = CGRAM_SIZE if self.cgram_mode else DDRAM_SIZE
+        self.ac = (self.ac + step) % size
+        if shift_display and not self.cgram_mode:
+            self.shift = (self.shift + step) % self.line_width()
+
+    def write_nibble(self, rs, nibble, now):
+        """Accept nibble latched by falling edge of EN while R/W is low."""
+
+        if self.busy(now):
+            self.violations += 1
+        if not rs and nibble == 0:
+            self.zero_nibbles += 1
+            if self.zero_nibbles >= SYNC_NIBBLES:
+                self.zero_nibbles = 0
+                self.eight_bit = True
+                self.pending = None
+                return
+        elif not rs:
+            self.zero_nibbles = 0
+        if self.eight_bit:
+            # Only D7-D4 are wired, D3-D0 read as zero
+            b = nibble << 4
+        elif self.pending is None:
+            self.pending = nibble
+            return
+        else:
+            b = self.pending << 4 | nibble
+            self.pending = None
+        if rs:
+            self.data_write(b, now)
+        else:
+            self.instruction(b, now)
+
+    def instruction(self, b, now):
+        """Execute instruction byte."""
+
+        t = EXEC_TIME
+        if self.graphics_mode and b & IMASK_DDRAM_ADDR:
+            self.gx = b & (GDRAM_WIDTH - 1)
+        elif self.graphics_mode and b & IMASK_CGRAM_ADDR:
+            self.gpage = b & (GDRAM_PAGES - 1)
+        elif b & IMASK_DDRAM_ADDR:
+            self.ac = b & (DDRAM_SIZE - 1)
+            self.cgram_mode = False
+        elif b & IMASK_CGRAM_ADDR:
+            self.ac = b & (CGRAM_SIZE - 1)
+            self.cgram_mode = True
+        elif b & IMASK_FUNC:
+            self.eight_bit = bool(b & PMASK_8BIT_MODE)
+            self.lines = 2 if b & PMASK_LINES[1] else 1
+            self.font = b & 0x03
+        elif b & IMASK_CURS_DISP_SHIFT:
+            if b & 0x03 == IMASK_GCMODE_PWR & 0x03:
+                self.graphics_mode = bool(b & PMASK_GRAPHICS_MODE)
+                self.intpwr = bool(b & PMASK_PWR_ON)
+            else:
+                step = 1 if b & PMASK_SHIFT_MOVE_RIGHT else -1
+                if b & PMASK_DISP_SHIFT:
+                    self.shift = (self.shift - step) % self.line_width()
+                else:
+                    self.ac = (self.ac + step) % DDRAM_SIZE
+        elif b & IMASK_DISP_CTL:
+            self.disp_on = bool(b & PMASK_DISP_ON)
+            self.curs_on = bool(b & PMASK_CURS_ON)
+            self.blink_on = bool(b & PMASK_BLINK_ON)
+        elif b & IMASK_ENTRY_MODE:
+            self.increment = bool(b & PMASK_INC)
+            self.display_shift = bool(b & PMASK_DISP_SHIFT_EN)
+        elif b & IMASK_RET_HOME:
+            self.ac = 0
+            self.cgram_mode = False
+            self.shift = 0
+            t = EXEC_TIME_SLOW
+        elif b & IMASK_CLR_DISP:
+            self.ddram[:] = bytes([BLANK] * DDRAM_SIZE)
+            self.ac = 0
+            self.cgram_mode = False
+            self.shift = 0
+            self.increment = True
+            t = EXEC_TIME_SLOW
+        self.busy_until = now + t
+
+    def data_write(self, b, now):
+        """Write data byte to DDRAM or CGRAM at AC, or to graphics RAM in graphics mode."""
+
+        if self.graphics_mode:
+            self.gdram[self.gpage * GDRAM_WIDTH + self.gx] = b
+            self.gx = (self.gx + 1) % GDRAM_WIDTH
+        elif self.cgram_mode:
+            self.cgram[self.ac] = b
+        else:
+            self.ddram[self.ac] = b
+        self._advance_ac(self.display_shift)
+        self.busy_until = now + EXEC_TIME
+
+    def read_nibble_out(self, rs, now):
+        """Return nibble driven on D7-D4 after rising edge of EN while R/W is high."""
+
+        if rs:
+            b = self.cgram[self.ac] if self.cgram_mode else self.ddram[self.ac]
+        else:
+            if self.read_nibble == 0:
+                self.bf_reads += 1
+            b = self.ac
+            if self.busy(now):
+                b |= RMASK_BF
+        if self.eight_bit or self.read_nibble == 0:
+            return b >> 4
+        return b & 0xF
+
+    def read_done(self, rs):
+        """Complete read strobe on falling edge of EN while R/W is high."""
+
+        if not self.eight_bit and self.read_nibble == 0:
+            self.read_nibble = 1
+            return
+        self.read_nibble = 0
+        if rs:
+            self._advance_ac(False)
+
+    def graphics_screen(self, width=GRAPHICS_WIDTH):
+        """Return list of pixel rows of graphics RAM as strings of '#' and '.'."""
+
+        rows = []
+        for y in range(GDRAM_PAGES * PAGE_HEIGHT):
+            base = y // PAGE_HEIGHT * GDRAM_WIDTH
+            rows.append(''.join('#' if self.gdram[base + x] >> y % PAGE_HEIGHT & 1 else '.' for x in range(width)))
+        return rows
+
+    def screen(self, cols=16):
+        """Return list of bytes objects with 'cols' visible characters per line."""
+
+        width = self.line_width()
+        res = []
+        for line in range(self.lines):
+            base = line * width
+            row = bytes(self.ddram[base + (self.shift + c) % width] for c in range(cols))
+            res.append(row)
+        return res
+
+# ===========================================================================
+# PCF8574 emulator transport
+# ===========================================================================
+
+class PCF8574Emulator(Transport):
+    """Transport emulating PCF8574 with WS0010 connected to its port.
+    Emulated time is 'clock' time plus time spent on I2C bus at 'speed'.
+    With 'rdwr' set strobed reads are counted as single combined transfer."""
+
+    ## Constructor
+    def __init__(self, speed=BUS_SPEED, clock=perf_counter, rdwr=False):
+        self.controller = WS0010Controller()
+        self._clock = clock
+        self._byte_time = BUS_BYTE_BITS / speed
+        self.combined_reads = rdwr
+        self._bus_time = 0.0    # accumulated I2C transfer time
+        self._bus_time_mark = 0.0
+        self._port = 0xFF       # PCF8574 output latch, high after power-on
+        self._out = 0x0F        # nibble driven by controller while reading
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Zeroize transaction counters."""
+
+        self.writes = 0         # write transactions
+        self.reads = 0          # read transactions
+        self.bytes_written = 0  # bytes written to port
+        self._bus_time_mark = self._bus_time
+        self.controller.bf_reads = 0
+        self.controller.violations = 0
+
+    @property
+    def bus_time(self):
+        """Time spent on I2C bus since counters reset."""
+
+        return self._bus_time - self._bus_time_mark
+
+    def now(self):
+        """Return current emulated time."""
+
+        return self._clock() + self._bus_time
+
+    def _transaction(self):
+        """Account address byte of new I2C transaction."""
+
+        self._bus_time += self._byte_time
+
+    def _port_write(self, b):
+        """Put byte to port latch and process control pin edges."""
+
+        self._bus_time += self._byte_time
+        self.bytes_written += 1
+        old = self._port
+        self._port = b
+        rw = b & PIN_RW
+        rs = bool(b & PIN_RS)
+        if not old & PIN_EN and b & PIN_EN and rw:
+            self._out = self.controller.read_nibble_out(rs, self.now())
+        elif old & PIN_EN and not b & PIN_EN:
+            if old & PIN_RW:
+                self.controller.read_done(bool(old & PIN_RS))
+            else:
+                self.controller.write_nibble(bool(old & PIN_RS), old & PIN_DATA, self.now())
+
+    def _port_read(self):
+        """Return state of port pins."""
+
+        self._bus_time += self._byte_time
+        b = self._port
+        if b & PIN_RW and b & PIN_EN:
+            # Quasi-bidirectional I/Os: controller can only pull high pins low
+            b &= ~PIN_DATA | self._out
+        return b
+
+    def write8(self, b):
+        """Write one byte to PCF8574 port."""
+
+        self.writes += 1
+        self._transaction()
+        self._port_write(b & 0xFF)
+
+    def read8(self):
+        """Read one byte from PCF8574 port."""
+
+        self.reads += 1
+        self._transaction()
+        return self._port_read()
+
+    def write(self, data):
+        """Write sequence of bytes to PCF8574 port by one I2C transaction."""
+
+        self.writes += 1
+        self._transaction()
+        for b in data:
+            self._port_write(b & 0xFF)
+
+    def strobe_read(self, low, high, count):
+        """Set port to 'low', then 'count' times: set port to 'high',
+        read port, set port back to 'low'. Return list of read values."""
+
+        if not self.combined_reads:
+            return Transport.strobe_read(self, low, high, count)
+        self.writes += 1
+        self._transaction()
+        self._port_write(low)
+        res = []
+        while count:
+            self._transaction()
+            self._port_write(high)
+            self._transaction()
+            res.append(self._port_read())
+            self._transaction()
+            self._port_write(low)
+            count -= 1
+        return res
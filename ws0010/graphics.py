@@ -0,0 +1,227 @@
+"""
+    Bitmap of WS0010 graphics mode and drawing primitives.
+    Bitmap is packed the way graphics RAM is written: screen is split into
+    pages of 8 pixel rows, every byte holds one column of a page with the
+    top pixel in bit 0. NumPy array is used for storage if NumPy is
+    installed (faster clearing and change detection), bytearray otherwise.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+GRAPHICS_WIDTH  = 100   # pixel columns of 16x2 panel in graphics mode
+GRAPHICS_HEIGHT = 16    # pixel rows of 2 line panel in graphics mode
+PAGE_HEIGHT     = 8     # pixel rows per byte of graphics RAM
+
+BLIT_COPY       = 'copy'    # blit: source replaces destination pixels
+BLIT_OR         = 'or'      # blit: source set pixels are set in destination
+BLIT_XOR        = 'xor'     # blit: source set pixels invert destination pixels
+
+# ===========================================================================
+# Bitmap Class
+# ===========================================================================
+
+class Bitmap:
+    """Monochrome bitmap of 'width' x 'height' pixels.
+    Coordinates start from top left corner, drawing outside is clipped.
+    Parameter 'on' of drawing methods sets (True) or clears (False) pixels."""
+
+    ## Constructor
+    def __init__(self, width=GRAPHICS_WIDTH, height=GRAPHICS_HEIGHT, use_numpy=True):
+        self.width = width
+        self.height = height
+        self.pages = (height + PAGE_HEIGHT - 1) // PAGE_HEIGHT
+        size = self.pages * width
+        if use_numpy and numpy is not None:
+            self.data = numpy.zeros(size, dtype=numpy.uint8)   # column bytes, page by page
+        else:
+            self.data = bytearray(size)
+
+    def copy(self):
+        """Return copy of bitmap."""
+
+        res = Bitmap(self.width, self.height, numpy is not None and not isinstance(self.data, bytearray))
+        res.data[:] = self.data
+        return res
+
+    def tobytes(self):
+        """Return column bytes of all pages."""
+
+        return bytes(self.data)
+
+    def page(self, page):
+        """Return column bytes of 'page'."""
+
+        start = page * self.width
+        return bytes(self.data[start:start + self.width])
+
+    def clear(self, on=False):
+        """Clear all pixels or set them if 'on' is True."""
+
+        v = 0xFF if on else 0
+        if isinstance(self.data, bytearray):
+            self.data[:] = bytes([v]) * len(self.data)
+        else:
+            self.data[:] = v
+
+    def _apply(self, start, end, mask, on):
+        """Set or clear 'mask' bits of column bytes from 'start' up to 'end' (exclusive)."""
+
+        if start >= end or not mask:
+            return
+        data = self.data
+        if not isinstance(data, bytearray):
+            if on:
+                data[start:end] |= mask
+            else:
+                data[start:end] &= ~mask & 0xFF
+        elif on:
+            for i in range(start, end):
+                data[i] |= mask
+        else:
+            mask = ~mask & 0xFF
+            for i in range(start, end):
+                data[i] &= mask
+
+    def get(self, x, y):
+        """Return True if pixel at 'x', 'y' is set."""
+
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.data[y // PAGE_HEIGHT * self.width + x] >> (y % PAGE_HEIGHT) & 1)
+
+    def pixel(self, x, y, on=True):
+        """Set or clear pixel at 'x', 'y'."""
+
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = y // PAGE_HEIGHT * self.width + x
+            self._apply(i, i + 1, 1 << y % PAGE_HEIGHT, on)
+
+    def fill_rect(self, x, y, w, h, on=True):
+        """Set or clear all pixels of rectangle with top left corner at 'x', 'y', 'w' wide and 'h' high."""
+
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        y0 = max(y, 0)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        for page in range(y0 // PAGE_HEIGHT, (y1 - 1) // PAGE_HEIGHT + 1):
+            top = page * PAGE_HEIGHT
+            mask = 0
+            for row in range(max(y0, top), min(y1, top + PAGE_HEIGHT)):
+                mask |= 1 << row - top
+            base = page * self.width
+            self._apply(base + x0, base + x1, mask, on)
+
+    def hline(self, x, y, w, on=True):
+        """Draw horizontal line of 'w' pixels from 'x', 'y' to the right."""
+
+        self.fill_rect(x, y, w, 1, on)
+
+    def vline(self, x, y, h, on=True):
+        """Draw vertical line of 'h' pixels from 'x', 'y' down."""
+
+        self.fill_rect(x, y, 1, h, on)
+
+    def line(self, x0, y0, x1, y1, on=True):
+        """Draw line from 'x0', 'y0' to 'x1', 'y1' inclusive (Bresenham's algorithm)."""
+
+        if y0 == y1:
+            self.hline(min(x0, x1), y0, abs(x1 - x0) + 1, on)
+            return
+        if x0 == x1:
+            self.vline(x0, min(y0, y1), abs(y1 - y0) + 1, on)
+            return
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x0, y0, on)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def rect(self, x, y, w, h, on=True, fill=False):
+        """Draw outline of rectangle (filled if 'fill' is True)."""
+
+        if fill:
+            self.fill_rect(x, y, w, h, on)
+            return
+        if w <= 0 or h <= 0:
+            return
+        self.hline(x, y, w, on)
+        self.hline(x, y + h - 1, w, on)
+        self.vline(x, y, h, on)
+        self.vline(x + w - 1, y, h, on)
+
+    def column(self, x):
+        """Return pixels of column 'x' as integer, top pixel in bit 0."""
+
+        v = 0
+        for page in range(self.pages):
+            v |= int(self.data[page * self.width + x]) << page * PAGE_HEIGHT
+        return v
+
+    def set_column(self, x, v):
+        """Set pixels of column 'x' from integer 'v', top pixel in bit 0."""
+
+        v &= (1 << self.height) - 1
+        for page in range(self.pages):
+            self.data[page * self.width + x] = v >> page * PAGE_HEIGHT & 0xFF
+
+    def blit(self, src, x, y, op=BLIT_COPY):
+        """Draw bitmap 'src' with its top left corner at 'x', 'y' combining pixels by 'op'."""
+
+        srcmask = (1 << src.height) - 1
+        for sx in range(max(-x, 0), min(src.width, self.width - x)):
+            v = src.column(sx)
+            mask = srcmask
+            if y >= 0:
+                v <<= y
+                mask <<= y
+            else:
+                v >>= -y
+                mask >>= -y
+            dst = self.column(x + sx)
+            if op == BLIT_COPY:
+                dst = dst & ~mask | v
+            elif op == BLIT_OR:
+                dst |= v
+            elif op == BLIT_XOR:
+                dst ^= v
+            else:
+                raise ValueError('Unknown blit operation: {}'.format(op))
+            self.set_column(x + sx, dst)
+
+    def changes(self, prev):
+        """Return list of (page, start, end) runs of columns differing
+        from bytes-like 'prev' of the same layout ('end' is exclusive)."""
+
+        if not isinstance(self.data, bytearray):
+            diff = numpy.flatnonzero(self.data != numpy.frombuffer(bytes(prev), dtype=numpy.uint8)).tolist()
+        else:
+            data = self.data
+            diff = [i for i in range(len(data)) if data[i] != prev[i]]
+        runs = []
+        for i in diff:
+            (page, x) = divmod(i, self.width)
+            if runs and runs[-1][0] == page and runs[-1][2] == x:
+                runs[-1][2] = x + 1
+            else:
+                runs.append([page, x, x + 1])
+        return [tuple(r) for r in runs]
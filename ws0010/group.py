@@ -0,0 +1,230 @@
+"""
+    Manager of many WS0010 panels on several I2C buses.
+    Every bus has its own worker thread, so buses are driven in parallel.
+    Operations of panels sharing a bus are split into chunks and
+    interleaved round-robin: in timed mode a panel executing instruction
+    does not hold the bus, the worker writes to other panels meanwhile.
+    Mirror groups write the same content to several panels with text
+    encoded once per font table.
+"""
+
+import threading
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import Future
+from .sched import _Task, op_write, op_read, op_shift, op_call, CHUNK_SIZE
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+THREAD_NAME     = 'ws0010-bus{}'
+
+# ===========================================================================
+# Bus worker
+# ===========================================================================
+
+class _BusWorker:
+    """Worker thread driving panels of one I2C bus."""
+
+    ## Constructor
+    def __init__(self, bus):
+        self._queues = {}       # pending tasks by panel
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME.format(bus), daemon=True)
+        self._thread.start()
+
+    def add(self, lcd):
+        """Attach panel 'lcd' to worker."""
+
+        with self._cond:
+            self._queues[lcd] = deque()
+
+    def submit(self, lcd, op, *args, **kwargs):
+        """Queue chunked operation 'op(lcd, *args, **kwargs)'. Return its Future."""
+
+        task = _Task(op, args, kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Display group is closed')
+            self._queues[lcd].append(task)
+            self._cond.notify()
+        return task.future
+
+    def _active(self):
+        """Return panels with pending tasks."""
+
+        return [lcd for (lcd, queue) in self._queues.items() if queue]
+
+    def _run(self):
+        """Worker thread: run one step of every panel with pending tasks in turn.
+        Panels keep instructions queued while the worker is busy."""
+
+        while True:
+            with self._cond:
+                while not self._active() and not self._closed:
+                    self._cond.wait()
+                if not self._active():
+                    return
+            with ExitStack() as stack:
+                deferred = set()
+                while True:
+                    with self._cond:
+                        active = self._active()
+                    if not active:
+                        break
+                    for lcd in active:
+                        if lcd not in deferred:
+                            stack.enter_context(lcd.deferred())
+                            deferred.add(lcd)
+                        if not self._queues[lcd][0].step(lcd):
+                            with self._cond:
+                                self._queues[lcd].popleft()
+
+    def close(self):
+        """Complete queued tasks and stop worker thread."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+def _gather(futures):
+    """Return Future completed by list of results of all 'futures'
+    or by exception of the first failed one when all of them are done."""
+
+    res = Future()
+    res.set_running_or_notify_cancel()
+    left = [len(futures)]
+    lock = threading.Lock()
+
+    def done(fut):
+        with lock:
+            left[0] -= 1
+            if left[0]:
+                return
+        for f in futures:
+            if f.cancelled() or f.exception() is not None:
+                if f.cancelled():
+                    res.cancel()
+                else:
+                    res.set_exception(f.exception())
+                return
+        res.set_result([f.result() for f in futures])
+
+    for f in futures:
+        f.add_done_callback(done)
+    return res
+
+# ===========================================================================
+# Display group Class
+# ===========================================================================
+
+class DisplayGroup:
+    """Set of named WS0010 panels and mirror groups of them.
+    Operations are addressed to panel or mirror group name and return
+    concurrent.futures.Future: of the operation result for panel, of list
+    of results for mirror group. Panels are driven by worker of their
+    I2C bus, timed mode of panels lets workers overlap execution times."""
+
+    ## Constructor
+    def __init__(self, chunk=CHUNK_SIZE):
+        self._chunk = chunk
+        self._panels = {}       # WS0010 instances by name
+        self._mirrors = {}      # panel names by mirror group name
+        self._workers = {}      # bus workers by I2C bus number
+
+    def add(self, name, lcd):
+        """Add WS0010 instance 'lcd' as panel 'name'."""
+
+        if name in self._panels or name in self._mirrors:
+            raise ValueError('Name already used: {}'.format(name))
+        worker = self._workers.get(lcd._bus)
+        if worker is None:
+            worker = self._workers[lcd._bus] = _BusWorker(lcd._bus)
+        worker.add(lcd)
+        self._panels[name] = lcd
+
+    def mirror(self, name, panels):
+        """Define mirror group 'name' of panels named in 'panels'."""
+
+        if name in self._panels or name in self._mirrors:
+            raise ValueError('Name already used: {}'.format(name))
+        for p in panels:
+            if p not in self._panels:
+                raise KeyError('Unknown panel: {}'.format(p))
+        self._mirrors[name] = list(panels)
+
+    def panel(self, name):
+        """Return WS0010 instance of panel 'name'."""
+
+        return self._panels[name]
+
+    def _targets(self, target):
+        """Return list of WS0010 instances addressed by panel or mirror group name 'target'."""
+
+        if target in self._panels:
+            return [self._panels[target]]
+        if target in self._mirrors:
+            return [self._panels[p] for p in self._mirrors[target]]
+        raise KeyError('Unknown panel or mirror group: {}'.format(target))
+
+    def _result(self, target, futures):
+        """Return Future of operation addressed to 'target' from Futures of its panels."""
+
+        return futures[0] if target in self._panels else _gather(futures)
+
+    def _submit(self, target, op, *args):
+        """Queue chunked operation 'op' to panels addressed by 'target'."""
+
+        return self._result(target,
+            [self._workers[lcd._bus].submit(lcd, op, *args) for lcd in self._targets(target)])
+
+    def write_many(self, target, fields):
+        """Output (line, col, string) 'fields'. Strings are encoded once per font table of target panels.
+        Panels with custom glyphs encode strings by their worker, as CGRAM slots differ between panels."""
+
+        fields = list(fields)
+        lcds = self._targets(target)
+        encoded = {}
+        for lcd in lcds:
+            if lcd._glyphs:
+                encoded[lcd] = fields
+            elif lcd._codec not in encoded:
+                encoded[lcd._codec] = [(line, col, lcd._encode(string)) for (line, col, string) in fields]
+        return self._result(target, [self._workers[lcd._bus].submit(lcd, op_write,
+            encoded[lcd if lcd._glyphs else lcd._codec], self._chunk) for lcd in lcds])
+
+    def write(self, target, line, col, string):
+        """Output a 'string' to 'line' at column 'col'."""
+
+        return self.write_many(target, [(line, col, string)])
+
+    def putline(self, target, string, line):
+        """Output a 'string' to specified 'line' of screen."""
+
+        return self.write_many(target, [(line, 0, string)])
+
+    def read_ddram(self, target, ac=0, size=1):
+        """Read 'size' bytes of data from 'ac' position."""
+
+        return self._submit(target, op_read, ac, size, self._chunk)
+
+    def shift_display(self, target, count=1):
+        """Shift display by 'count' steps."""
+
+        return self._submit(target, op_shift, count, self._chunk)
+
+    def call(self, target, method, *args, **kwargs):
+        """Call WS0010 method named 'method' with 'args' and 'kwargs' as single step."""
+
+        return self._result(target, [self._workers[lcd._bus].submit(lcd, op_call, getattr(lcd, method), *args,
+            **kwargs) for lcd in self._targets(target)])
+
+    def close(self):
+        """Complete queued operations and stop bus workers."""
+
+        for worker in self._workers.values():
+            worker.close()
+        self._workers = {}
@@ -0,0 +1,118 @@
+"""
+    Native access to Linux I2C bus (/dev/i2c-N) for PCF8574.
+    Combined write/read sequences are packed into single I2C_RDWR ioctl.
+"""
+
+import os
+import fcntl
+import ctypes
+from .transport import Transport
+
+# ===========================================================================
+# Linux i2c-dev interface (linux/i2c-dev.h, linux/i2c.h)
+# ===========================================================================
+
+I2C_SLAVE           = 0x0703    # ioctl: set slave address for read()/write()
+I2C_RDWR            = 0x0707    # ioctl: combined read/write transfer
+I2C_M_RD            = 0x0001    # message flag: read data from slave
+I2C_RDWR_MAX_MSGS   = 42        # maximum messages per I2C_RDWR ioctl
+
+DEV_PATH            = '/dev/i2c-{}'
+
+class _I2CMsg(ctypes.Structure):
+    """struct i2c_msg"""
+    _fields_ = [
+        ('addr', ctypes.c_uint16),
+        ('flags', ctypes.c_uint16),
+        ('len', ctypes.c_uint16),
+        ('buf', ctypes.POINTER(ctypes.c_uint8))]
+
+class _I2CRdwrData(ctypes.Structure):
+    """struct i2c_rdwr_ioctl_data"""
+    _fields_ = [
+        ('msgs', ctypes.POINTER(_I2CMsg)),
+        ('nmsgs', ctypes.c_uint32)]
+
+# ===========================================================================
+# I2C bus device class
+# ===========================================================================
+
+class I2CBus(Transport):
+
+    combined_reads = True
+
+    ## Constructor
+    def __init__(self, address, bus):
+        self._address = address # I2C address of slave
+        self._bus = bus         # I2C bus number
+        self._fd = os.open(DEV_PATH.format(bus), os.O_RDWR)
+        fcntl.ioctl(self._fd, I2C_SLAVE, address)
+
+    def close(self):
+        """Close bus device."""
+
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def write8(self, b):
+        """Write one byte to slave."""
+
+        os.write(self._fd, bytes((b & 0xFF,)))
+
+    def read8(self):
+        """Read one byte from slave."""
+
+        return os.read(self._fd, 1)[0]
+
+    def write(self, data):
+        """Write sequence of bytes to slave by one I2C transaction."""
+
+        os.write(self._fd, bytes(data))
+
+    def transfer(self, msgs):
+        """Perform combined transfer by single I2C_RDWR ioctl.
+        Each element of 'msgs' is either bytes-like object (write message)
+        or integer (read message of that length).
+        Return list of bytes objects, one per read message."""
+
+        if not msgs:
+            return []
+        if len(msgs) > I2C_RDWR_MAX_MSGS:
+            raise ValueError('Too many messages for I2C_RDWR: {}'.format(len(msgs)))
+        bufs = []
+        cmsgs = (_I2CMsg * len(msgs))()
+        for i, m in enumerate(msgs):
+            if isinstance(m, int):
+                buf = (ctypes.c_uint8 * m)()
+                flags = I2C_M_RD
+            else:
+                buf = (ctypes.c_uint8 * len(m)).from_buffer_copy(bytes(m))
+                flags = 0
+            bufs.append((buf, flags))
+            cmsgs[i].addr = self._address
+            cmsgs[i].flags = flags
+            cmsgs[i].len = len(buf)
+            cmsgs[i].buf = ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8))
+        data = _I2CRdwrData(cmsgs, len(msgs))
+        fcntl.ioctl(self._fd, I2C_RDWR, data)
+        return [bytes(buf) for (buf, flags) in bufs if flags & I2C_M_RD]
+
+    def strobe_read(self, low, high, count):
+        """Set port to 'low', then 'count' times: set port to 'high',
+        read port, set port back to 'low'. Return list of read values.
+        Consecutive 'low' and 'high' writes are merged into one message,
+        so up to 20 reads are done by one I2C_RDWR ioctl."""
+
+        res = []
+        per_ioctl = (I2C_RDWR_MAX_MSGS - 1) // 2
+        while count:
+            n = min(count, per_ioctl)
+            msgs = []
+            for i in range(n):
+                msgs.append((low, high))
+                msgs.append(1)
+            msgs.append((low,))
+            res.extend(r[0] for r in self.transfer(msgs))
+            count -= n
+        return res
@@ -0,0 +1,122 @@
+"""
+    Advisory locking of I2C bus shared by several threads and processes.
+    Lock is taken around each public WS0010 operation (a batch of
+    instructions and data), not around single port writes, and released
+    between operations so other bus users get their turn.
+"""
+
+import os
+import fcntl
+import threading
+from functools import wraps
+from .ws0010 import WS0010
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+LOCK_PATH       = '/run/lock/ws0010-i2c-{}.lock'    # lock file of I2C bus number
+
+# Internal methods doing bus transactions outside of public methods
+# (chunked operations of Scheduler and DisplayGroup, glyph uploads by encoding)
+LOCKED_HELPERS  = ('_drainI', '_sendDrun', '_read_raw', '_checkBF')
+
+# ===========================================================================
+# Bus lock
+# ===========================================================================
+
+class BusLock:
+    """Reentrant lock of bus with lock file 'path': thread lock for users
+    inside process and flock() on 'path' for other processes. Lock file is taken on the
+    outermost acquire only. Use for_bus() to share one lock between
+    all displays of a bus in the process."""
+
+    _registry = {}                      # locks by path
+    _registry_lock = threading.Lock()
+
+    ## Constructor
+    def __init__(self, path):
+        self._path = path
+        self._rlock = threading.RLock()
+        self._fd = None         # descriptor of locked file, opened on the first acquire
+        self._depth = 0         # nesting depth of owner thread
+        self.acquisitions = 0   # outermost acquisitions
+
+    @classmethod
+    def for_bus(cls, bus):
+        """Return process-wide lock of I2C bus number 'bus' (lock file LOCK_PATH)."""
+
+        path = LOCK_PATH.format(bus)
+        with cls._registry_lock:
+            lock = cls._registry.get(path)
+            if lock is None:
+                lock = cls._registry[path] = cls(path)
+            return lock
+
+    @property
+    def depth(self):
+        """Nesting depth of lock owner, 0 if lock is not held."""
+
+        return self._depth
+
+    def acquire(self):
+        """Acquire lock, blocking until other threads and processes release it."""
+
+        self._rlock.acquire()
+        if not self._depth:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self._path, os.O_RDONLY | os.O_CREAT, 0o666)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._rlock.release()
+                raise
+            self.acquisitions += 1
+        self._depth += 1
+
+    def release(self):
+        """Release lock. File lock is released by the outermost release."""
+
+        self._depth -= 1
+        if not self._depth:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._rlock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def close(self):
+        """Close lock file. Lock must not be held."""
+
+        with self._rlock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def attach(self, lcd):
+        """Make public methods of WS0010 instance 'lcd' run under the lock.
+        Port bytes buffered by the operation are sent before the lock is released.
+        Bus transactions of internal helpers (sending of instructions queued by
+        deferred() block, data runs, DDRAM and BF reads) are locked as well."""
+
+        for name in dir(WS0010):
+            if name.startswith('_') or not callable(getattr(WS0010, name)):
+                continue
+            setattr(lcd, name, self._wrap(lcd, getattr(lcd, name)))
+        for name in LOCKED_HELPERS:
+            setattr(lcd, name, self._wrap(lcd, getattr(lcd, name)))
+
+    def _wrap(self, lcd, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    if self._depth == 1:
+                        lcd._flush()
+        return wrapper
@@ -0,0 +1,196 @@
+"""
+    Marquee scrolled by display shift of WS0010.
+    Texts are written to whole DDRAM lines once, every frame is a single
+    Cursor/Display Shift instruction. Columns leaving the screen are
+    refilled by the following characters of texts while they are off-screen,
+    so texts of any length scroll as endless loops. Display shift moves
+    all lines together, hence every line of the screen is a marquee line.
+"""
+
+import threading
+from time import perf_counter
+from .ws0010 import DDRAM_SIZE, BLANK
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+SCREEN_WIDTH    = 16    # visible columns of screen
+FRAME_PERIOD    = .25   # seconds between frames
+GAP             = 4     # blank columns between repetitions of text
+
+THREAD_NAME     = 'ws0010-marquee'
+
+# ===========================================================================
+# Marquee Class
+# ===========================================================================
+
+class Marquee:
+    """Marquee of WS0010 instance 'lcd' with 'width' visible columns.
+    Text of every line moves to the left by one column per frame and
+    repeats after 'gap' blank columns. Off-screen columns are refilled
+    by runs of at least 'batch' columns (half of off-screen part if not set).
+    Frames are made either by step() calls or by worker thread started
+    with start(), not both."""
+
+    ## Constructor
+    def __init__(self, lcd, width=SCREEN_WIDTH, period=FRAME_PERIOD, gap=GAP, batch=None, clock=perf_counter):
+        self._lcd = lcd
+        self._ring = DDRAM_SIZE // lcd._lines   # DDRAM columns of line
+        self._width = width
+        self._period = period
+        self._gap = gap
+        if batch is None:
+            batch = (self._ring - width) // 2
+        self._batch = max(1, min(batch, self._ring - width))
+        self._clock = clock
+        self._pos = None        # DDRAM column at left edge of screen counted from start, None before start
+        self._texts = {}        # texts by line
+        self._loops = {}        # texts followed by gap by line, None if not made yet
+        self._origin = {}       # column where loop of line starts, None if at the next start
+        self._end = {}          # next column of line to be written
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.frames = 0         # frames made by worker thread
+        self.dropped = 0        # frames skipped by worker thread running late
+        for line in range(1, lcd._lines + 1):
+            self.set_text(line, '')
+
+    def set_text(self, line, text):
+        """Set 'text' (str or pre-encoded bytes-like object) of 'line'.
+        While marquee runs the new text enters the screen after the visible columns."""
+
+        line = (line - 1) % self._lcd._lines + 1
+        with self._cond:
+            self._texts[line] = text
+            self._loops[line] = None
+            if self._pos is None:
+                self._origin[line] = None
+            else:
+                self._origin[line] = self._end[line] = self._pos + self._width
+
+    def _loop(self, line):
+        """Return loop of 'line' text. Loop is kept unencoded (unless text is
+        pre-encoded), characters are encoded when they are written, so CGRAM
+        slots of custom glyphs are current."""
+
+        loop = self._loops[line]
+        if loop is None:
+            text = self._texts[line]
+            if isinstance(text, str):
+                loop = text + ' ' * self._gap or ' '
+            else:
+                loop = bytes(text) + bytes([BLANK] * self._gap) or bytes([BLANK])
+            self._loops[line] = loop
+        return loop
+
+    def _fields(self, line, start, end):
+        """Return write_many() fields of 'line' loop columns from 'start' up to 'end' (exclusive)."""
+
+        loop = self._loop(line)
+        origin = self._origin[line]
+        index = [(a - origin) % len(loop) for a in range(start, end)]
+        symbols = ''.join(loop[i] for i in index) if isinstance(loop, str) else bytes(loop[i] for i in index)
+        fields = []
+        off = 0
+        while off < len(symbols):
+            col = (start + off) % self._ring
+            size = min(self._ring - col, len(symbols) - off)
+            fields.append((line, col, symbols[off:off + size]))
+            off += size
+        return fields
+
+    def _refill(self, force=False):
+        """Write off-screen columns of lines whose free part reached batch size
+        (or of all lines if 'force' is True). Return number of columns written."""
+
+        fields = []
+        count = 0
+        limit = self._pos + self._ring
+        for line in self._texts:
+            start = self._end[line]
+            if start < limit and (force or limit - start >= self._batch or start <= self._pos + self._width):
+                fields.extend(self._fields(line, start, limit))
+                count += limit - start
+                self._end[line] = limit
+        if fields:
+            self._lcd.write_many(fields)
+        return count
+
+    def _start(self):
+        """Write whole lines with display shift as the left edge of screen."""
+
+        lcd = self._lcd
+        if lcd._dshift is None:
+            lcd.ret_home()
+        self._pos = lcd._dshift
+        for line in self._texts:
+            if self._origin[line] is None:
+                self._origin[line] = self._pos
+            self._end[line] = self._pos
+        return self._refill(force=True)
+
+    def step(self):
+        """Make one frame: scroll lines by one column and refill off-screen columns.
+        The first frame writes lines without scrolling. Display shifted
+        bypassing marquee is detected and lines are rewritten.
+        Return number of columns written."""
+
+        with self._cond:
+            lcd = self._lcd
+            if self._pos is None or lcd._dshift != self._pos % self._ring:
+                return self._start()
+            lcd.shift_display(-1)
+            self._pos += 1
+            return self._refill()
+
+    def reset(self):
+        """Make the next frame rewrite lines with texts from their beginning."""
+
+        with self._cond:
+            self._pos = None
+            for line in self._texts:
+                self._origin[line] = None
+
+    def _run(self):
+        """Worker thread: make frames every period. Frames are skipped
+        rather than made in a burst when the worker runs late."""
+
+        deadline = self._clock()
+        while True:
+            with self._cond:
+                while self._running:
+                    delay = deadline - self._clock()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if not self._running:
+                    return
+            self.step()
+            self.frames += 1
+            deadline += self._period
+            late = int((self._clock() - deadline) / self._period)
+            if late > 0:
+                self.dropped += late
+                deadline += late * self._period
+
+    def start(self):
+        """Start worker thread making frames."""
+
+        if self._thread is not None:
+            raise RuntimeError('Marquee already started')
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop worker thread. Screen keeps the last frame."""
+
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
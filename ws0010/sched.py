@@ -0,0 +1,221 @@
+"""
+    Priority scheduler of WS0010 operations.
+    Long operations are split into chunks of a few bytes, and the scheduler
+    picks the most urgent operation before every chunk, so high priority
+    update waits at most for one chunk of a background redraw.
+    Operation resumed after preemption sets DDRAM address again,
+    reads restore address counter found at their start or resumption.
+"""
+
+import heapq
+import threading
+import itertools
+from concurrent.futures import Future
+from .ws0010 import IMASK_DDRAM_ADDR, DDRAM_ADDR, DDRAM_SIZE
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+PRIO_HIGH       = 0     # priorities: lower value runs first
+PRIO_NORMAL     = 10
+PRIO_LOW        = 20
+
+CHUNK_SIZE      = 4     # default symbols (or shift steps) per chunk
+THREAD_NAME     = 'ws0010-sched'
+
+# ===========================================================================
+# Chunked operations
+# Operation is generator function taking WS0010 instance as first argument.
+# It does one chunk of work per step, yields between steps and returns
+# result of the operation.
+# ===========================================================================
+
+def op_write(lcd, fields, chunk=CHUNK_SIZE):
+    """Write (line, col, string) 'fields' by chunks of 'chunk' symbols.
+    Every chunk is encoded when it is written, so CGRAM slots of custom glyphs
+    can not be reassigned by other operations between encoding and writing."""
+
+    first = True
+    for (line, col, string) in fields:
+        line = (line - 1) % 2 + 1
+        col = max(col, 0)
+        if not isinstance(string, str):
+            string = bytes(string)
+        string = string[:max(DDRAM_SIZE - DDRAM_ADDR[line - 1] - col, 0)]
+        for off in range(0, len(string), chunk):
+            if not first:
+                yield
+            first = False
+            lcd.write_many([(line, col + off, string[off:off + chunk])])
+
+def op_read(lcd, ac=0, size=1, chunk=CHUNK_SIZE):
+    """Read 'size' bytes of DDRAM from 'ac' position by chunks of 'chunk' bytes.
+    Address counter is restored after every chunk, the restoring instruction
+    is dropped by peephole when the next chunk follows immediately."""
+
+    ac = min(max(ac, 0), DDRAM_SIZE - 1)
+    size = min(max(size, 1), DDRAM_SIZE)
+    if lcd._shadow is not None:
+        return lcd.read_ddram(ac, size)
+    step = 1 if lcd._increment else -1
+    data = bytearray()
+    restore = None
+    while len(data) < size:
+        if lcd._iqueue != [restore]:
+            # Another operation ran since the previous chunk
+            restore = IMASK_DDRAM_ADDR | lcd._get_ac()
+        n = min(chunk, size - len(data))
+        data += lcd._read_raw((ac + step * len(data)) % DDRAM_SIZE, n)
+        lcd._queueI(restore)
+        if len(data) < size:
+            yield
+    return lcd._decode(data)
+
+def op_shift(lcd, count=1, chunk=CHUNK_SIZE):
+    """Shift display by 'count' steps taken the short way round, 'chunk' steps at once."""
+
+    width = DDRAM_SIZE // lcd._lines
+    net = count % width
+    if net > width // 2:
+        net -= width
+    while net:
+        n = max(-chunk, min(chunk, net))
+        lcd.shift_display(n)
+        if lcd._iqueue:
+            lcd._drainI()
+        net -= n
+        if net:
+            yield
+
+def op_call(lcd, func, *args, **kwargs):
+    """Call 'func(*args, **kwargs)' as single step."""
+
+    return func(*args, **kwargs)
+    yield
+
+# ===========================================================================
+# Scheduler Class
+# ===========================================================================
+
+class _Task:
+    """Scheduled operation."""
+
+    __slots__ = ('op', 'args', 'kwargs', 'future', 'gen')
+
+    ## Constructor
+    def __init__(self, op, args, kwargs):
+        self.op = op
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.gen = None         # operation generator, created when operation starts
+
+    def step(self, lcd):
+        """Run one step of operation on WS0010 instance 'lcd'.
+        Return True if the operation is not completed."""
+
+        if self.gen is None:
+            if not self.future.set_running_or_notify_cancel():
+                return False
+            self.gen = self.op(lcd, *self.args, **self.kwargs)
+        try:
+            next(self.gen)
+        except StopIteration as e:
+            # Completed operation must reach controller before its result is reported
+            if lcd._iqueue:
+                lcd._drainI()
+            self.future.set_result(e.value)
+            return False
+        except BaseException as e:
+            self.future.set_exception(e)
+            return False
+        return True
+
+class Scheduler:
+    """Scheduler running operations on WS0010 instance 'lcd' by worker thread.
+    The worker runs one chunk of the most urgent operation at a time,
+    operations of the same priority run in order of submission.
+    Methods return concurrent.futures.Future of the operation result."""
+
+    ## Constructor
+    def __init__(self, lcd, chunk=CHUNK_SIZE):
+        self._lcd = lcd
+        self._chunk = chunk
+        self._ready = []                # heap of (priority, sequence number, task)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def submit(self, op, *args, priority=PRIO_NORMAL, **kwargs):
+        """Schedule chunked operation 'op(lcd, *args, **kwargs)' with 'priority'.
+        Return Future of its result."""
+
+        task = _Task(op, args, kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Scheduler is closed')
+            heapq.heappush(self._ready, (priority, next(self._seq), task))
+            self._cond.notify()
+        return task.future
+
+    def write(self, line, col, string, priority=PRIO_NORMAL):
+        """Schedule output of a 'string' to 'line' at column 'col'."""
+
+        return self.submit(op_write, [(line, col, string)], self._chunk, priority=priority)
+
+    def putline(self, string, line, priority=PRIO_NORMAL):
+        """Schedule output of a 'string' to specified 'line' of screen."""
+
+        return self.write(line, 0, string, priority)
+
+    def write_many(self, fields, priority=PRIO_NORMAL):
+        """Schedule output of (line, col, string) 'fields'."""
+
+        return self.submit(op_write, list(fields), self._chunk, priority=priority)
+
+    def read_ddram(self, ac=0, size=1, priority=PRIO_NORMAL):
+        """Schedule read of 'size' bytes of data from 'ac' position."""
+
+        return self.submit(op_read, ac, size, self._chunk, priority=priority)
+
+    def shift_display(self, count=1, priority=PRIO_NORMAL):
+        """Schedule display shift by 'count' steps."""
+
+        return self.submit(op_shift, count, self._chunk, priority=priority)
+
+    def call(self, func, *args, priority=PRIO_NORMAL, **kwargs):
+        """Schedule call of 'func(*args, **kwargs)' as single step, e.g. lcd.clear_display."""
+
+        return self.submit(op_call, func, *args, priority=priority, **kwargs)
+
+    def _run(self):
+        """Worker thread: run steps of scheduled operations.
+        Instructions are queued while the worker is busy, so address
+        instructions made void by the next chunk are not sent at all."""
+
+        while True:
+            with self._cond:
+                while not self._ready and not self._closed:
+                    self._cond.wait()
+                if not self._ready:
+                    return
+            with self._lcd.deferred():
+                while True:
+                    with self._cond:
+                        if not self._ready:
+                            break
+                        entry = heapq.heappop(self._ready)
+                    if entry[2].step(self._lcd):
+                        with self._cond:
+                            heapq.heappush(self._ready, entry)
+
+    def close(self):
+        """Complete scheduled operations and stop worker thread."""
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
@@ -0,0 +1,264 @@
+"""
+    Opt-in instrumentation of WS0010 hot path: bus transaction counters,
+    busy flag polling statistics, instruction counters by opcode and
+    latency histograms of public methods.
+    Instrumentation wraps display methods and transport of particular
+    WS0010 instance, so display without statistics runs unchanged code.
+"""
+
+from time import perf_counter
+from functools import wraps
+from .ws0010 import WS0010, PIN_RS, instr_name
+
+# ===========================================================================
+# Constants
+# ===========================================================================
+
+# Upper bounds of latency histogram buckets, in seconds
+HIST_BOUNDS = (.0001, .0002, .0005, .001, .002, .005, .01, .02, .05, .1, .2, .5, 1.0)
+
+# ===========================================================================
+# Latency histogram
+# ===========================================================================
+
+class Histogram:
+
+    ## Constructor
+    def __init__(self, bounds=HIST_BOUNDS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # last bucket is for values above all bounds
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, v):
+        """Account value 'v'."""
+
+        i = 0
+        for bound in self.bounds:
+            if v <= bound:
+                break
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += v
+        if self.min is None or v < self.min:
+            self.min = v
+        if self.max is None or v > self.max:
+            self.max = v
+
+    def mean(self):
+        """Return mean value or None if nothing accounted."""
+
+        return self.total / self.count if self.count else None
+
+    def as_dict(self):
+        """Return histogram as dictionary."""
+
+        return {
+            'bounds': list(self.bounds),
+            'buckets': list(self.buckets),
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+# ===========================================================================
+# Counting transport proxy
+# ===========================================================================
+
+class _CountingTransport:
+    """Proxy counting bus transactions of wrapped transport."""
+
+    ## Constructor
+    def __init__(self, transport, stats):
+        self._transport = transport
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._transport, name)
+
+    def write8(self, b):
+        self._stats.writes += 1
+        self._stats.bytes_written += 1
+        self._transport.write8(b)
+
+    def read8(self):
+        self._stats.reads += 1
+        return self._transport.read8()
+
+    def write(self, data):
+        self._stats.writes += 1
+        self._stats.bytes_written += len(data)
+        self._transport.write(data)
+
+    def strobe_read(self, low, high, count):
+        # Transport with combined transfers does the whole sequence by one transaction
+        if self._transport.combined_reads:
+            self._stats.writes += 1
+        else:
+            self._stats.writes += 1 + 2 * count
+            self._stats.reads += count
+        self._stats.bytes_written += 1 + 2 * count
+        if not low & PIN_RS:
+            self._stats.bf_polls += 1
+        return self._transport.strobe_read(low, high, count)
+
+# ===========================================================================
+# Statistics
+# ===========================================================================
+
+class Stats:
+
+    ## Constructor
+    def __init__(self):
+        self._lcd = None
+        self._saved = {}        # instance methods of display replaced by instrumentation
+        self.reset()
+
+    def reset(self):
+        """Zeroize counters and histograms."""
+
+        self.writes = 0             # bus write transactions
+        self.reads = 0              # bus read transactions
+        self.bytes_written = 0      # bytes written to PCF8574 port
+        self.bf_checks = 0          # busy flag checks
+        self.bf_check_time = 0.0    # time spent in busy flag checks
+        self.bf_polls = 0           # busy flag read iterations
+        self.bf_sleeps = 0          # sleeps while waiting for busy flag
+        self.bf_sleep_time = 0.0    # time spent in sleeps while waiting for busy flag
+        self.ready_waits = 0        # waits for execution time in timed mode
+        self.ready_wait_time = 0.0  # time spent waiting for execution time in timed mode
+        self.data_nibbles = 0       # data nibbles sent
+        self.instructions = {}      # instructions sent, by name
+        self.latency = {}           # histograms of public method latencies, by method name
+
+    def attach(self, lcd):
+        """Install instrumentation into WS0010 instance 'lcd'."""
+
+        if self._lcd is not None:
+            raise RuntimeError('Statistics already attached')
+        self._lcd = lcd
+        self._saved = {name: v for (name, v) in vars(lcd).items() if callable(getattr(WS0010, name, None))}
+        lcd._device = _CountingTransport(lcd._device, self)
+        lcd._sleep = self._wrap_sleep(lcd._sleep)
+        lcd._checkBF = self._wrap_checkBF(lcd._checkBF)
+        lcd._wait_ready = self._wrap_wait_ready(lcd._wait_ready)
+        lcd._sendI = self._wrap_sendI(lcd._sendI)
+        lcd._send4 = self._wrap_send4(lcd._send4)
+        for name in dir(WS0010):
+            if name.startswith('_') or not callable(getattr(WS0010, name)):
+                continue
+            setattr(lcd, name, self._wrap_method(name, getattr(lcd, name)))
+
+    def detach(self):
+        """Remove instrumentation from WS0010 instance."""
+
+        lcd = self._lcd
+        if lcd is None:
+            return
+        for name in list(vars(lcd)):
+            if callable(getattr(WS0010, name, None)):
+                delattr(lcd, name)
+        # Wrappers installed before instrumentation (e.g. bus lock) stay
+        for (name, v) in self._saved.items():
+            setattr(lcd, name, v)
+        lcd._device = lcd._device._transport
+        lcd._sleep = lcd._sleep.__wrapped__
+        self._lcd = None
+
+    def _wrap_sleep(self, func):
+        @wraps(func)
+        def wrapper(t):
+            self.bf_sleeps += 1
+            start = perf_counter()
+            func(t)
+            self.bf_sleep_time += perf_counter() - start
+        return wrapper
+
+    def _wrap_checkBF(self, func):
+        @wraps(func)
+        def wrapper(*args):
+            self.bf_checks += 1
+            start = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.bf_check_time += perf_counter() - start
+        return wrapper
+
+    def _wrap_wait_ready(self, func):
+        @wraps(func)
+        def wrapper():
+            self.ready_waits += 1
+            start = perf_counter()
+            func()
+            self.ready_wait_time += perf_counter() - start
+        return wrapper
+
+    def _wrap_sendI(self, func):
+        @wraps(func)
+        def wrapper(b):
+            name = instr_name(b)
+            self.instructions[name] = self.instructions.get(name, 0) + 1
+            func(b)
+        return wrapper
+
+    def _wrap_send4(self, func):
+        @wraps(func)
+        def wrapper(b, rs=False):
+            if rs:
+                self.data_nibbles += 1
+            func(b, rs)
+        return wrapper
+
+    def _wrap_method(self, name, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                t = perf_counter() - start
+                try:
+                    self.latency[name].add(t)
+                except KeyError:
+                    self.latency[name] = Histogram()
+                    self.latency[name].add(t)
+        return wrapper
+
+    def as_dict(self):
+        """Return statistics as dictionary."""
+
+        return {
+            'writes': self.writes,
+            'reads': self.reads,
+            'bytes_written': self.bytes_written,
+            'bf_checks': self.bf_checks,
+            'bf_check_time': self.bf_check_time,
+            'bf_polls': self.bf_polls,
+            'bf_sleeps': self.bf_sleeps,
+            'bf_sleep_time': self.bf_sleep_time,
+            'ready_waits': self.ready_waits,
+            'ready_wait_time': self.ready_wait_time,
+            'data_bytes': self.data_nibbles // 2,
+            'instructions': dict(self.instructions),
+            'latency': {k: v.as_dict() for (k, v) in self.latency.items()}
+        }
+
+    def report(self):
+        """Return statistics as human readable text."""
+
+        lines = [
+            'bus: {} writes, {} reads, {} bytes written'.format(self.writes, self.reads, self.bytes_written),
+            'busy flag: {} checks, {:.3f} ms checking, {} polls, {} sleeps, {:.3f} ms sleeping'.format(self.bf_checks,
+                self.bf_check_time * 1000, self.bf_polls, self.bf_sleeps, self.bf_sleep_time * 1000),
+            'timed waits: {}, {:.3f} ms waiting'.format(self.ready_waits, self.ready_wait_time * 1000),
+            'data bytes: {}'.format(self.data_nibbles // 2),
+            'instructions: {}'.format(', '.join('{} {}'.format(k, v) for (k, v) in sorted(self.instructions.items())))]
+        for (name, hist) in sorted(self.latency.items()):
+            lines.append('{}: {} calls, mean {:.3f} ms, min {:.3f} ms, max {:.3f} ms'.format(name,
+                hist.count, hist.mean() * 1000, hist.min * 1000, hist.max * 1000))
+        return '\n'.join(lines)
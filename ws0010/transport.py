@@ -0,0 +1,86 @@
+"""
+    Bus transports to PCF8574 8-Bit I/O expander.
+"""
+
+try:
+    import i2cdev
+except ImportError:
+    i2cdev = None
+
+# ===========================================================================
+# Transport base class
+# ===========================================================================
+
+class Transport:
+    """Base class of PCF8574 transport.
+    Subclasses must implement write8() and read8(). Multi-byte writes
+    and strobed reads are built from them unless overridden by a subclass
+    able to do them in fewer bus transactions."""
+
+    combined_reads = False  # strobe_read() is done by single bus transaction
+
+    def write8(self, b):
+        """Write one byte to PCF8574 port."""
+
+        raise NotImplementedError
+
+    def read8(self):
+        """Read one byte from PCF8574 port."""
+
+        raise NotImplementedError
+
+    def write(self, data):
+        """Write sequence of bytes to PCF8574 port."""
+
+        for b in data:
+            self.write8(b)
+
+    def strobe_read(self, low, high, count):
+        """Set port to 'low', then 'count' times: set port to 'high',
+        read port, set port back to 'low'. Return list of read values."""
+
+        res = []
+        self.write8(low)
+        while count:
+            self.write8(high)
+            res.append(self.read8())
+            self.write8(low)
+            count -= 1
+        return res
+
+    def close(self):
+        """Release transport resources."""
+
+        pass
+
+# ===========================================================================
+# Transport through i2cdev module
+# ===========================================================================
+
+class I2CDevTransport(Transport):
+
+    ## Constructor
+    def __init__(self, address, bus):
+        if i2cdev is None:
+            raise ImportError('i2cdev module is required for i2cdev transport')
+        self._device = i2cdev.i2cdev(address, bus)
+
+    def write8(self, b):
+        """Write one byte to PCF8574 port."""
+
+        self._device.write8(b)
+
+    def read8(self):
+        """Read one byte from PCF8574 port."""
+
+        return self._device.read8()
+
+    def write(self, data):
+        """Write sequence of bytes to PCF8574 port,
+        by one I2C transaction if i2cdev device supports it."""
+
+        write = getattr(self._device, 'write', None)
+        if write:
+            write(bytes(data))
+        else:
+            Transport.write(self, data)
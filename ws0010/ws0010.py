@@ -1,7 +1,12 @@
 #! /usr/bin/python3
 
-import i2cdev
-from time import sleep
+from time import sleep, perf_counter
+from contextlib import contextmanager
+from collections import OrderedDict
+from .transport import I2CDevTransport
+from .i2cbus import I2CBus
+from .graphics import Bitmap, GRAPHICS_WIDTH, GRAPHICS_HEIGHT
+from .codec import TRANSLATE_RU, UNTRANSLATE_RU, CODEC_ENJP, CODEC_ENRU, ERRORS_MASK
 
 # ===========================================================================
 # Control pins numbering
@@ -60,26 +65,63 @@ IMASK_DDRAM_ADDR        = 0x80  # Instruction: Set DDRAM (Display Data RAM) Addr
 
 WAIT_BF         = .001  # wait time between consequtive checking of BF
 WAIT_SLOW       = .0001 # wait time between instructions
+TXBUF_SIZE      = 240   # maximum length of single multi-byte I2C write in buffered mode
+BLANK           = 0x20  # DDRAM contents after Clear Display
+COST_BYTE       = 6     # port writes per byte sent (2 nibbles by 3 writes)
+COST_BF         = 7     # port writes and reads per BF check
 MAX_LINES       = 2     # maximum lines number
 DDRAM_ADDR      = [0x0, 0x40]   # initial DDRAM addresses per line
 DDRAM_SIZE      = 128   # DDRAM size in bytes
+CGRAM_SIZE      = 64    # CGRAM size in bytes
+CGRAM_SLOTS     = 8     # custom glyphs in CGRAM, glyph in slot N is shown by symbol code N
+GLYPH_ROWS      = 8     # CGRAM bytes (pixel rows) per custom glyph
+EXEC_TIME       = .00004    # execution time of instruction or data write, in seconds
+EXEC_TIME_SLOW  = .0062     # execution time of Clear Display and Return Home, in seconds
+TIMED_MARGIN    = 1.25      # safety factor for execution times in timed mode
+SPIN_TIME       = .0002     # wait shorter than this is done by spinning on high-resolution clock
+BF_BACKOFF_MIN  = .00002    # first delay between BF polls in adaptive mode
+BF_EST_ALPHA    = .125      # weight of new observation in execution time estimates
+PROBE_ADDR      = 0x45      # DDRAM address set and read back to verify interface (nibbles differ, BF clear if swapped)
+PROBE_POLLS     = 10        # BF polls before controller is taken as not responding
+BF_TIMEOUT      = .05       # BF set longer than this is taken as loss of nibble alignment
+
+BACKEND_I2CDEV  = 'i2cdev'  # bus access through i2cdev module
+BACKEND_RDWR    = 'rdwr'    # native /dev/i2c-N access with combined I2C_RDWR transfers
 
 # ===========================================================================
-# Translation table for russian letters
+# Codecs of character font tables
 # ===========================================================================
 
-TRANSLATE_RU = {
-    'А': 0x41, 'Б': 0xA0, 'В': 0x42, 'Г': 0xA1, 'Д': 0xE0, 'Е': 0x45, 'Ж': 0xA3, 'З': 0xA4,
-    'И': 0xA5, 'Й': 0xA6, 'К': 0x4B, 'Л': 0xA7, 'М': 0x4D, 'Н': 0x48, 'О': 0x4F, 'П': 0xA8,
-    'Р': 0x50, 'С': 0x43, 'Т': 0x54, 'У': 0xA9, 'Ф': 0xAA, 'Х': 0x58, 'Ц': 0xE1, 'Ч': 0xAB,
-    'Ш': 0xAC, 'Щ': 0xE2, 'Ъ': 0xAD, 'Ы': 0xAE, 'Ь': 0x62, 'Э': 0xAF, 'Ю': 0xB0, 'Я': 0xB1,
-    'Ё': 0xA2, 'ё': 0xB5,
-    'а': 0x61, 'б': 0xB2, 'в': 0xB3, 'г': 0xB4, 'д': 0xE3, 'е': 0x65, 'ж': 0xB6, 'з': 0xB7,
-    'и': 0xB8, 'й': 0xB9, 'к': 0xBA, 'л': 0xBB, 'м': 0xBC, 'н': 0xBD, 'о': 0x6F, 'п': 0xBE,
-    'р': 0x70, 'с': 0x63, 'т': 0xBF, 'у': 0x79, 'ф': 0xE4, 'х': 0x78, 'ц': 0xE5, 'ч': 0xC0,
-    'ш': 0xC1, 'щ': 0xE6, 'ъ': 0xC2, 'ы': 0xC3, 'ь': 0xC4, 'э': 0xC5, 'ю': 0xC6, 'я': 0xC7 }
+FONT_CODECS = {
+    PMASK_FT_ENJP: CODEC_ENJP,
+    PMASK_FT_ENRU: CODEC_ENRU }
 
-UNTRANSLATE_RU = {v: k for k, v in TRANSLATE_RU.items()}
+# ===========================================================================
+# Instruction names
+# ===========================================================================
+
+INSTR_NAMES = [
+    (IMASK_DDRAM_ADDR, 'ddram_addr'),
+    (IMASK_CGRAM_ADDR, 'cgram_addr'),
+    (IMASK_FUNC, 'func'),
+    (IMASK_CURS_DISP_SHIFT, 'shift'),
+    (IMASK_DISP_CTL, 'disp_ctl'),
+    (IMASK_ENTRY_MODE, 'entry_mode'),
+    (IMASK_RET_HOME, 'home'),
+    (IMASK_CLR_DISP, 'clear')]
+
+REG_NAMES = ('func', 'disp_ctl', 'entry_mode', 'gcmode_pwr')    # instructions writing controller registers
+AC_NAMES = ('ddram_addr', 'cgram_addr', 'cursor_move')          # instructions changing address counter only
+
+def instr_name(b):
+    """Return name of instruction encoded by byte 'b'."""
+
+    for (mask, name) in INSTR_NAMES:
+        if b & mask:
+            if mask == IMASK_CURS_DISP_SHIFT and b & 0x03 == IMASK_GCMODE_PWR & 0x03:
+                return 'gcmode_pwr'
+            return name
+    return 'nop'
 
 # ===========================================================================
 # LCD Winstar WS0010 Class
@@ -88,13 +130,31 @@ UNTRANSLATE_RU = {v: k for k, v in TRANSLATE_RU.items()}
 class WS0010:
 
     ## Constructor
-    def __init__(self, address, bus, lines=2):
+    def __init__(self, address, bus, lines=2, buffered=False, backend=BACKEND_I2CDEV, transport=None, stats=False,
+            framebuffer=False, timed=False, adaptive=False, font=PMASK_FT_ENRU, lock=None, attach=False):
         self._address = address # I2C address of PCF8754
         self._bus = bus         # I2C bus number
-        self._device = i2cdev.i2cdev(address, bus)
+        if transport is not None:
+            self._device = transport
+        elif backend == BACKEND_I2CDEV:
+            self._device = I2CDevTransport(address, bus)
+        elif backend == BACKEND_RDWR:
+            self._device = I2CBus(address, bus)
+        else:
+            raise ValueError('Unknown bus backend: {}'.format(backend))
+        self._buffered = buffered   # collect port bytes and send them by multi-byte I2C writes
+        self._txbuf = bytearray()   # pending port bytes in buffered mode
+        self._timed = timed         # wait for execution time instead of checking BF after writes
+        self._ready_at = 0.0        # time when controller completes last instruction in timed mode
+        self._adaptive = adaptive   # delay BF polls by learned execution times
+        self.bf_estimates = {'data': EXEC_TIME, 'instr': EXEC_TIME, 'slow': EXEC_TIME_SLOW}
         if lines > MAX_LINES:
             lines = MAX_LINES
         self._lines = lines     # lines of screen
+        if font not in FONT_CODECS:
+            raise ValueError('Unsupported font table: {}'.format(font))
+        self._font = font       # character font table
+        self._codec = FONT_CODECS[font]
         self._disp_on = False
         self._curs_on = False
         self._blink_on = False
@@ -102,7 +162,37 @@ class WS0010:
         self._display_shift = False
         self._graphics_mode = False
         self._intpwr = True
-        self.initialize()
+        self._iqueue = []       # queued instructions
+        self._defer = 0         # nesting depth of deferred() blocks
+        self._regs = {}         # last instruction bytes written to controller registers, by name
+        self._ac = None         # address counter tracked by software, None if unknown
+        self._ac_cgram = False  # tracked address counter points to CGRAM
+        self._dshift = None     # display shift tracked by software, None if unknown
+        self._shadow = None     # host copy of DDRAM contents, None if unknown
+        self._fb = None         # framebuffer to be flushed to DDRAM
+        self._resyncing = False
+        self.desyncs = 0        # losses of interface alignment detected and repaired
+        self._glyphs = {}       # custom glyphs (rows, fallback character) by character
+        self._slots = OrderedDict() # CGRAM slots of resident glyphs by character, least recently used first
+        self.gfx = None         # bitmap of graphics mode
+        self._gfx_shadow = None # bitmap bytes in graphics RAM, None if unknown
+        if framebuffer:
+            self._fb = bytearray([BLANK] * DDRAM_SIZE)
+        self._sleep = sleep     # sleep function, replaced by instrumentation
+        self.bus_lock = None    # advisory bus lock held during public methods
+        if lock:
+            from .lock import BusLock
+            self.bus_lock = lock if isinstance(lock, BusLock) else BusLock.for_bus(bus)
+            self.bus_lock.attach(self)
+        self.stats = None       # instrumentation statistics
+        if stats:
+            from .stats import Stats
+            self.stats = Stats()
+            self.stats.attach(self)
+        if attach:
+            self.adopt()
+        else:
+            self.initialize()
 
     @staticmethod
     def _prop_setter(prop, param):
@@ -159,29 +249,347 @@ class WS0010:
     def _gcmpwr_make_instr(self):
         """Make GC Mode/Internal Power instruction byte according to property values."""
         instr = IMASK_GCMODE_PWR
-        for (p, m) in (self._graphics_mode, PMASK_GRAPHICS_MODE), (self._display_shift, PMASK_PWR_ON):
+        for (p, m) in (self._graphics_mode, PMASK_GRAPHICS_MODE), (self._intpwr, PMASK_PWR_ON):
             if p:
                 instr |= m
         return instr
 
+    def _write8(self, b):
+        """Write port byte to PCF8574 or append it to transaction buffer in buffered mode."""
+
+        if self._buffered:
+            self._txbuf.append(b)
+            if len(self._txbuf) >= TXBUF_SIZE:
+                self._flush()
+        else:
+            self._device.write8(b)
+
+    def _flush(self):
+        """Send pending port bytes of transaction buffer as one multi-byte I2C write.
+        PCF8574 latches every received byte to its port, so the sequence
+        reaches LCD pins exactly as it would by single writes."""
+
+        if not self._txbuf:
+            return
+        self._device.write(bytes(self._txbuf))
+        del self._txbuf[:]
+
     def _latch(self, b):
         """Latch command with EN input."""
-        self._device.write8(b | PIN_EN)
-        self._device.write8(b)
+        self._write8(b | PIN_EN)
+        self._write8(b)
 
     def _sendI(self, b):
         """Send instruction byte."""
 
+        if self._timed:
+            self._wait_ready()
         self._send4(b >> 4)
         self._send4(b)
-        self._checkBF()
+        slow = b in (IMASK_CLR_DISP, IMASK_RET_HOME)
+        if self._timed:
+            self._set_ready(EXEC_TIME_SLOW if slow else EXEC_TIME)
+            self._track_instr(b)
+        else:
+            bfac = self._checkBF('slow' if slow else 'instr')
+            self._track_instr(b)
+            self._verify(bfac)
 
     def _sendD(self, b):
         """Send data byte."""
 
+        if self._iqueue:
+            self._drainI()
+        if self._timed:
+            self._wait_ready()
         self._send4(b >> 4, True)
         self._send4(b, True)
-        self._checkBF()
+        if self._timed:
+            self._set_ready(EXEC_TIME)
+            self._track_data((b,))
+        else:
+            bfac = self._checkBF('data')
+            self._track_data((b,))
+            self._verify(bfac)
+
+    def _set_ready(self, t):
+        """Timed mode: send pending port bytes and set time when controller
+        completes just sent instruction executed for 't' seconds."""
+
+        self._flush()
+        self._ready_at = perf_counter() + t * TIMED_MARGIN
+
+    def _wait_ready(self):
+        """Timed mode: wait until controller completes last instruction."""
+
+        self._wait_until(self._ready_at)
+
+    def _wait_until(self, deadline):
+        """Wait until 'deadline' of perf_counter() clock.
+        Long waits sleep, the rest is spent spinning on high-resolution clock."""
+
+        left = deadline - perf_counter()
+        if left <= 0:
+            return
+        if left > SPIN_TIME:
+            self._sleep(left - SPIN_TIME)
+        while perf_counter() < deadline:
+            pass
+
+    def _track_instr(self, b):
+        """Update software model of controller (address counter, display shift,
+        registers and DDRAM copy) after instruction 'b'.
+        In graphics mode address instructions select graphics RAM column and page,
+        so address counter of character mode becomes unknown."""
+
+        if b & (IMASK_DDRAM_ADDR | IMASK_CGRAM_ADDR) and self._regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE:
+            self._ac = None
+            return
+        if b & IMASK_DDRAM_ADDR:
+            self._ac = b & (DDRAM_SIZE - 1)
+            self._ac_cgram = False
+        elif b & IMASK_CGRAM_ADDR:
+            self._ac = b & (CGRAM_SIZE - 1)
+            self._ac_cgram = True
+        elif b & IMASK_FUNC:
+            self._regs['func'] = b
+        elif b & IMASK_CURS_DISP_SHIFT:
+            step = 1 if b & PMASK_SHIFT_MOVE_RIGHT else -1
+            if b & 0x03 == IMASK_GCMODE_PWR & 0x03:
+                self._regs['gcmode_pwr'] = b
+            elif b & PMASK_DISP_SHIFT:
+                if self._dshift is not None:
+                    self._dshift = (self._dshift - step) % (DDRAM_SIZE // self._lines)
+            elif self._ac is not None and not self._ac_cgram:
+                self._ac = (self._ac + step) % DDRAM_SIZE
+        elif b & IMASK_DISP_CTL:
+            self._regs['disp_ctl'] = b
+        elif b & IMASK_ENTRY_MODE:
+            self._regs['entry_mode'] = b
+            self._increment = bool(b & PMASK_INC)
+            self._display_shift = bool(b & PMASK_DISP_SHIFT_EN)
+        elif b & IMASK_RET_HOME:
+            self._ac = 0
+            self._ac_cgram = False
+            self._dshift = 0
+        elif b & IMASK_CLR_DISP:
+            # Clear Display also sets I/D of Entry Mode
+            self._ac = 0
+            self._ac_cgram = False
+            self._dshift = 0
+            self._increment = True
+            if 'entry_mode' in self._regs:
+                self._regs['entry_mode'] |= PMASK_INC
+            self._shadow = bytearray([BLANK] * DDRAM_SIZE)
+            if self._fb is not None:
+                self._fb[:] = self._shadow
+
+    def _track_data(self, symbols):
+        """Update software model of controller after data bytes 'symbols'.
+        Address counter moves according to Entry Mode I/D, display is shifted
+        as well if Entry Mode S is set. Data of graphics mode go to graphics RAM."""
+
+        if self._regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE:
+            return
+        if self._ac is None:
+            self._shadow = None
+            self._dshift = None
+            return
+        step = 1 if self._increment else -1
+        ac = self._ac
+        if self._ac_cgram:
+            self._ac = (ac + step * len(symbols)) % CGRAM_SIZE
+            return
+        for b in symbols:
+            if self._shadow is not None:
+                self._shadow[ac] = b
+            if self._fb is not None:
+                self._fb[ac] = b
+            ac = (ac + step) % DDRAM_SIZE
+        self._ac = ac
+        if self._display_shift and self._dshift is not None:
+            self._dshift = (self._dshift + step * len(symbols)) % (DDRAM_SIZE // self._lines)
+
+    def _get_ac(self):
+        """Return address counter from software model,
+        read it from controller only if the model is invalidated."""
+
+        if self._iqueue:
+            self._drainI()
+        if self._ac is None:
+            self._ac = self.getAC()
+            self._ac_cgram = False
+        return self._ac
+
+    def invalidate(self):
+        """Invalidate software model of address counter, display shift and DDRAM copy.
+        Should be called if controller could be accessed bypassing this object."""
+
+        if self._iqueue:
+            self._drainI()
+        self._ac = None
+        self._dshift = None
+        self._shadow = None
+        self._gfx_shadow = None
+        self._slots.clear()
+        self._regs = {}
+
+    def _queueI(self, b):
+        """Queue instruction byte. Queue is sent immediately unless inside deferred() block."""
+
+        self._iqueue.append(b)
+        if not self._defer:
+            self._drainI()
+
+    def _drainI(self):
+        """Optimize and send queued instructions."""
+
+        queue = self._iqueue
+        self._iqueue = []
+        for b in self._peephole(queue):
+            self._sendI(b)
+
+    @contextmanager
+    def deferred(self):
+        """Context manager collecting instructions of the block into queue.
+        Queue is optimized and sent when the outermost block exits
+        or before any data is written or read."""
+
+        self._defer += 1
+        try:
+            yield self
+        finally:
+            self._defer -= 1
+            if not self._defer and self._iqueue:
+                self._drainI()
+
+    @staticmethod
+    def _peephole_name(b):
+        """Return instruction name for peephole, telling cursor moves and display shifts apart."""
+
+        name = instr_name(b)
+        if name == 'shift':
+            name = 'display_shift' if b & PMASK_DISP_SHIFT else 'cursor_move'
+        return name
+
+    def _peephole(self, queue):
+        """Return optimized copy of instruction list 'queue':
+        register writes equal to current register value or superseded
+        by later write are dropped, address sets and cursor moves made
+        void by later address set, Clear Display or Return Home are dropped,
+        Return Home following Clear Display is dropped, runs of display
+        shifts are reduced to their net effect taken the short way round.
+        In graphics mode address instructions are kept as is."""
+
+        out = []
+        regs = dict(self._regs)
+        ac = None if self._ac_cgram else self._ac   # AC after instructions in 'out', None if unknown
+        ac_base = ac                                # AC before removable address instructions in 'out'
+        cleared = False         # Clear Display is in 'out' and nothing moved AC or shift after it
+        for b in queue:
+            name = self._peephole_name(b)
+            graphics = regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE
+            if name in REG_NAMES:
+                if name in ('disp_ctl', 'entry_mode'):
+                    # Value in effect if earlier writes of the register are dropped
+                    out = [x for x in out if self._peephole_name(x) != name]
+                    base = self._regs.get(name)
+                    if name == 'entry_mode' and base is not None and IMASK_CLR_DISP in out:
+                        base |= PMASK_INC
+                    regs[name] = b
+                    if b == base:
+                        continue
+                elif regs.get(name) == b:
+                    continue
+                regs[name] = b
+            elif name in ('clear', 'home'):
+                if name == 'home' and cleared:
+                    continue
+                void = AC_NAMES + ('display_shift', 'home')
+                if name == 'clear':
+                    void += ('clear',)
+                    cleared = True
+                if not graphics:
+                    out = [x for x in out if self._peephole_name(x) not in void]
+                ac = ac_base = 0
+            elif name in AC_NAMES and not graphics:
+                if name == 'cgram_addr':
+                    new_ac = None
+                elif name == 'ddram_addr':
+                    new_ac = b & (DDRAM_SIZE - 1)
+                elif ac is not None:
+                    # Cursor move from known address becomes address set of the same cost
+                    step = 1 if b & PMASK_SHIFT_MOVE_RIGHT else -1
+                    new_ac = (ac + step) % DDRAM_SIZE
+                    b = IMASK_DDRAM_ADDR | new_ac
+                else:
+                    # Cursor moves from unknown address cancel each other
+                    cleared = False
+                    if out and self._peephole_name(out[-1]) == name and out[-1] != b:
+                        out.pop()
+                    else:
+                        out.append(b)
+                    continue
+                cleared = False
+                out = [x for x in out if self._peephole_name(x) not in AC_NAMES]
+                ac = new_ac
+                if ac is not None and ac == ac_base:
+                    continue
+            elif name in AC_NAMES:
+                ac = ac_base = None
+            elif name == 'display_shift':
+                cleared = False
+            out.append(b)
+        return self._peephole_shifts(out)
+
+    def _peephole_shifts(self, out):
+        """Reduce runs of display shifts in instruction list 'out'."""
+
+        width = DDRAM_SIZE // self._lines
+        res = []
+        net = 0
+        for b in out + [None]:
+            if b is not None and self._peephole_name(b) == 'display_shift':
+                net += 1 if b & PMASK_SHIFT_MOVE_RIGHT else -1
+                continue
+            if net:
+                net %= width
+                if net > width // 2:
+                    net -= width
+                instr = IMASK_CURS_DISP_SHIFT | PMASK_DISP_SHIFT
+                if net > 0:
+                    instr |= PMASK_SHIFT_MOVE_RIGHT
+                res.extend([instr] * abs(net))
+                net = 0
+            if b is not None:
+                res.append(b)
+        return res
+
+    def _sendDrun(self, symbols):
+        """Send run of data bytes.
+        In buffered mode the whole run goes to the bus by multi-byte writes
+        and BF is checked (or execution time waited in timed mode) once after
+        the last byte: I2C transfer of 6 port bytes per character lasts longer
+        than execution of data write by controller."""
+
+        if self._iqueue:
+            self._drainI()
+        if not self._buffered:
+            for b in symbols:
+                self._sendD(b)
+            return
+        if self._timed:
+            self._wait_ready()
+        for b in symbols:
+            self._send4(b >> 4, True)
+            self._send4(b, True)
+        if self._timed:
+            self._set_ready(EXEC_TIME)
+            self._track_data(symbols)
+        else:
+            bfac = self._checkBF('data')
+            self._track_data(symbols)
+            self._verify(bfac)
 
     def _send4(self, b, rs=False):
         """Send low nibble of byte.
@@ -190,43 +598,163 @@ class WS0010:
         b &= 0xF
         if rs:
             b |= PIN_RS
-        self._device.write8(b)
+        self._write8(b)
         self._latch(b)
 
-    def _checkBF(self):
+    def _strobe_read(self, ctl, count):
+        """Read 'count' nibbles with control pins 'ctl' strobing EN for each of them.
+        Return list of port values.
+        Transport may do the whole sequence by single combined transfer."""
+
+        return self._device.strobe_read(ctl, ctl | PIN_EN, count)
+
+    def _checkBF(self, cls=None):
         """Check BF (Busy Flag) and wait for BF will cleared.
-        Return AC (Address Counter)."""
+        Return AC (Address Counter).
+        Parameter 'cls' is class of just sent instruction ('data', 'instr' or 'slow').
+        In adaptive mode the first poll is delayed by estimated execution time
+        of the class, and following polls back off exponentially."""
+
+        # Send pending port bytes before bus direction changes
+        self._flush()
+
+        adaptive = self._adaptive and cls is not None
+        if adaptive:
+            sent = perf_counter()
+            self._wait_until(sent + self.bf_estimates[cls])
+            backoff = BF_BACKOFF_MIN
+            polls = 0
 
         # Set R/W pin
         ctl = PIN_RW | PIN_DATA
-        ctl_en = ctl | PIN_EN
-        self._device.write8(ctl)
+        begin = perf_counter()
 
         while True:
 
-            # Read high nibble of BFAC byte
-            self._device.write8(ctl_en)
-            bfac = (self._device.read8() & 0xF) << 4
-            self._device.write8(ctl)
-
-            # Read low nibble of BFAC byte
-            self._device.write8(ctl_en)
-            bfac |= self._device.read8() & 0xF
-            self._device.write8(ctl)
+            # Read high and low nibbles of BFAC byte
+            (hi, lo) = self._strobe_read(ctl, 2)
+            bfac = (hi & 0xF) << 4 | lo & 0xF
 
-            # Check BF
-            if bfac & RMASK_BF:
-                sleep(WAIT_BF)
-            else:
+            # Check BF, BF stuck in busy state means lost nibble alignment
+            if not bfac & RMASK_BF:
                 break
+            if perf_counter() - begin > BF_TIMEOUT:
+                self._write8(0)
+                return None
+            if adaptive:
+                polls += 1
+                self._wait_until(perf_counter() + backoff)
+                backoff = min(backoff * 2, WAIT_BF)
+            else:
+                self._sleep(WAIT_BF)
+
+        # Update estimate: shrink it while BF is found cleared at the first poll,
+        # otherwise move it towards observed execution time
+        if adaptive:
+            est = self.bf_estimates[cls]
+            if polls:
+                est += BF_EST_ALPHA * (perf_counter() - sent - est)
+            else:
+                est -= BF_EST_ALPHA * est
+            self.bf_estimates[cls] = est
 
         # Clear R/W pin
-        self._device.write8(0)
+        self._write8(0)
 
         # Return AC
         return bfac
 
-    getAC = _checkBF
+    def getAC(self):
+        """Read and return AC (Address Counter) from controller."""
+
+        if self._iqueue:
+            self._drainI()
+        ac = self._checkBF()
+        if ac is None:
+            self.resync()
+            ac = self._checkBF()
+        if self._ac is not None:
+            self._ac = ac
+        return ac
+
+    def _verify(self, bfac):
+        """Compare address counter read with BF after instruction or data write
+        ('bfac', None if BF got stuck) with software model. Interface is
+        resynchronized on mismatch."""
+
+        if self._ac is None or self._regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE or bfac == self._ac:
+            return
+        self.desyncs += 1
+        self.resync()
+
+    def check_sync(self):
+        """Verify nibble alignment in character mode and resynchronize interface
+        if it is lost. Instructions and data are verified by BF reads anyway,
+        but lost nibble of instruction not moving address counter is found
+        by the next write only, and timed mode does not read BF at all.
+        Address is set to PROBE_ADDR and back, both are read back: pending
+        nibble would turn them into other instructions.
+        Return False if loss of alignment was detected."""
+
+        if self._iqueue:
+            self._drainI()
+        if self._regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE:
+            return True
+        desyncs = self.desyncs
+        ac = self._get_ac()
+        restore = (IMASK_CGRAM_ADDR if self._ac_cgram else IMASK_DDRAM_ADDR) | ac
+        for b in (IMASK_DDRAM_ADDR | PROBE_ADDR, restore):
+            self._sendI(b)
+            if self._timed:
+                self._verify(self._checkBF())
+        return self.desyncs == desyncs
+
+    def resync(self):
+        """Recover from loss of 4-bit interface alignment (e.g. nibble dropped by
+        bus glitch) without clearing the screen. Synchronization sequence and
+        Function Set are sent, known registers and display shift are restored.
+        Misaligned bytes could run as any instruction (even Clear Display) or
+        write data anywhere, so DDRAM is read back by one batched pass and
+        cells differing from host copy are rewritten. Resident custom glyphs
+        are uploaded to CGRAM again. The address counter is restored at last."""
+
+        if self._resyncing:
+            raise RuntimeError('Resynchronization of WS0010 interface failed')
+        self._resyncing = True
+        try:
+            (ac, cgram, dshift, regs) = (self._ac, self._ac_cgram, self._dshift, dict(self._regs))
+            self._ac = None
+            self._sync()
+            for name in ('gcmode_pwr', 'disp_ctl'):
+                if name in regs:
+                    self._sendI(regs[name])
+            # Entry Mode is known even if only implied by Clear Display
+            self._sendI(self._emode_make_instr())
+            if regs.get('gcmode_pwr', 0) & PMASK_GRAPHICS_MODE:
+                self._gfx_shadow = None
+            else:
+                if dshift is not None:
+                    self._sendI(IMASK_RET_HOME)
+                    width = DDRAM_SIZE // self._lines
+                    count = dshift if dshift <= width // 2 else dshift - width
+                    instr = IMASK_CURS_DISP_SHIFT | PMASK_DISP_SHIFT
+                    if count < 0:
+                        instr |= PMASK_SHIFT_MOVE_RIGHT
+                    for i in range(abs(count)):
+                        self._sendI(instr)
+                if self._shadow is not None:
+                    if self._increment:
+                        data = self._read_raw(0, DDRAM_SIZE)
+                    else:
+                        data = self._read_raw(DDRAM_SIZE - 1, DDRAM_SIZE)[::-1]
+                    cells = {addr: b for (addr, b) in enumerate(self._shadow) if data[addr] != b}
+                    self._write_spans(self._cell_spans(cells))
+                for (c, slot) in self._slots.items():
+                    self._glyph_upload(slot, self._glyphs[c][0])
+                if ac is not None:
+                    self._sendI((IMASK_CGRAM_ADDR if cgram else IMASK_DDRAM_ADDR) | ac)
+        finally:
+            self._resyncing = False
 
     def dispctl_set(self, disp_on=None, curs_on=None, blink_on=None):
         """Set Display ON/OFF Control properties for display, cursor and blinking.
@@ -240,7 +768,7 @@ class WS0010:
         self._set_curs_on(curs_on)
         self._set_blink_on(blink_on)
         instr = self._dispctl_make_instr()
-        self._sendI(instr)
+        self._queueI(instr)
 
     def dispctl_get(self):
         """Return Display ON/OFF Control properties for display, cursor and blinking.
@@ -263,7 +791,7 @@ class WS0010:
         self._set_increment(increment)
         self._set_display_shift(display_shift)
         instr = self._emode_make_instr()
-        self._sendI(instr)
+        self._queueI(instr)
 
     def emode_get(self):
         """Return Display ON/OFF Control properties for display, cursor and blinking.
@@ -287,7 +815,7 @@ class WS0010:
         self._set_graphics_mode(graphics_mode)
         self._set_intpwr(intpwr)
         instr = self._gcmpwr_make_instr()
-        self._sendI(instr)
+        self._queueI(instr)
 
     def gcmpwr_get(self):
         """Return GC Mode/Internal Power properties for graphics/character mode
@@ -303,17 +831,32 @@ class WS0010:
     def clear_display(self):
         """Clear display (write 0x20 to whole DDRAM space)."""
 
-        self._sendI(IMASK_CLR_DISP)
+        self._queueI(IMASK_CLR_DISP)
 
     def ret_home(self):
         """Return home (set DDRAM address counter to 0 and return display to default position if it was shifted).
         DDRAM space is not changed."""
 
-        self._sendI(IMASK_RET_HOME)
+        self._queueI(IMASK_RET_HOME)
 
     def initialize(self):
         """Initialize controller for necessary mode (currently 4-bit mode only)."""
 
+        # Send queued instructions, registers are unknown after synchronization
+        if self._iqueue:
+            self._drainI()
+        self._regs = {}
+        self._ac = None
+        self._sync()
+
+        # Clear Display and Return Home
+        self._sendI(IMASK_CLR_DISP)
+        self._sendI(IMASK_RET_HOME)
+
+    def _sync(self):
+        """Send synchronization sequence for 4-bit mode and Function Set.
+        DDRAM, CGRAM and address counter are kept."""
+
         # Synchronization sequence for 4-bit mode
         self._send4(0)
         self._send4(0)
@@ -321,41 +864,414 @@ class WS0010:
         self._send4(0)
         self._send4(0)
 
-        # Function Set: 4bit mode, necessary lines number, en-ru font table
+        # Function Set: 4bit mode, necessary lines number, selected font table
         self._send4(IMASK_FUNC >> 4)
-        self._sendI(IMASK_FUNC | PMASK_LINES[self._lines - 1] | PMASK_FT_ENRU)
+        self._sendI(IMASK_FUNC | PMASK_LINES[self._lines - 1] | self._font)
 
-        # Clear Display and Return Home
-        self._sendI(IMASK_CLR_DISP)
-        self._sendI(IMASK_RET_HOME)
+    def _poll_bfac(self):
+        """Read BF and AC until BF is cleared, at most PROBE_POLLS times.
+        Return BF and AC byte with BF cleared, None if BF stays set."""
+
+        self._flush()
+        ctl = PIN_RW | PIN_DATA
+        bfac = None
+        for i in range(PROBE_POLLS):
+            (hi, lo) = self._strobe_read(ctl, 2)
+            bfac = (hi & 0xF) << 4 | lo & 0xF
+            if not bfac & RMASK_BF:
+                break
+            self._sleep(WAIT_BF)
+        self._write8(0)
+        return None if bfac & RMASK_BF else bfac
+
+    def _probe(self):
+        """Set DDRAM address PROBE_ADDR bypassing software model and read it back.
+        Return True if controller responds in 4-bit mode with aligned nibbles."""
+
+        if self._timed:
+            self._wait_ready()
+        b = IMASK_DDRAM_ADDR | PROBE_ADDR
+        self._send4(b >> 4)
+        self._send4(b)
+        return self._poll_bfac() == PROBE_ADDR
+
+    def adopt(self):
+        """Take over controller initialized before (e.g. by previous process)
+        keeping the screen. Interface is synchronized first by the sequence
+        which does not clear the screen: with a nibble pending, its first byte
+        can only be cursor move, address set or Function Set, while probe
+        instruction could change display state or shift. 4-bit mode is then
+        verified by setting DDRAM address and reading it back, initialize()
+        is the last resort. Entry Mode I/D is detected from the address
+        counter after data read, DDRAM is read back as trusted host copy
+        and the cursor is restored. Other registers are unknown until set.
+        Return True if the screen contents were kept."""
+
+        self.invalidate()
+        bfac = self._poll_bfac()
+        self._sync()
+        if not self._probe():
+            self.initialize()
+            return False
+
+        # Reading data moves address counter in direction of Entry Mode I/D
+        self._strobe_read(PIN_RS | PIN_RW | PIN_DATA, 2)
+        self._write8(0)
+        self._increment = self._poll_bfac() == PROBE_ADDR + 1
+
+        # Read DDRAM contents in direction of address counter
+        if self._increment:
+            data = self._read_raw(0, DDRAM_SIZE)
+        else:
+            data = self._read_raw(DDRAM_SIZE - 1, DDRAM_SIZE)[::-1]
+        self._shadow = data
+        if self._fb is not None:
+            self._fb[:] = data
+        self._queueI(IMASK_DDRAM_ADDR | (bfac if bfac is not None else 0))
+        return True
 
     def poweroff(self):
         """Turn off power."""
 
-        self._sendI(IMASK_GCMODE_PWR)
+        self._queueI(IMASK_GCMODE_PWR)
+
+    def _encode(self, string, pinned=None):
+        """Convert 'string' to bytes of controller symbols by codec of font table.
+        Characters of custom glyphs are converted to codes of their CGRAM slots,
+        glyphs are uploaded if needed (see _glyph_codes() for 'pinned').
+        Bytes-like 'string' is taken as already encoded."""
+
+        if isinstance(string, str):
+            if self._glyphs:
+                chars = [c for c in dict.fromkeys(string) if c in self._glyphs]
+                if chars:
+                    codes = self._glyph_codes(chars, pinned)
+                    string = string.translate({ord(c): codes[c] for c in chars})
+            return string.encode(self._codec, ERRORS_MASK)
+        return bytes(string)
 
     def puts(self, string):
-        """Output a 'string' beginning from current position of screen."""
+        """Output a 'string' beginning from current position of screen.
+        'string' is either str or bytes-like object of controller symbols
+        encoded beforehand, e.g. by 'ws0010-enru' codec."""
 
         # Output string
-        for char in string:
-            try:
-                symbol = TRANSLATE_RU[char]
-            except KeyError:
-                symbol = ord(char) & 0xFF
-            self._sendD(symbol)
+        self._sendDrun(self._encode(string))
 
     def putline(self, string, line):
-        """Output a 'string' to specified 'line' of screen."""
+        """Output a 'string' (str or pre-encoded bytes-like object) to specified 'line' of screen.
+        In framebuffer mode only changed characters are sent."""
 
         # Circle line number (take line_number modulo line_numbers) and get DDRAM address
         line = (line - 1) % 2 + 1
         addr = DDRAM_ADDR[line - 1]
-        self._sendI(IMASK_DDRAM_ADDR | addr)
+
+        if self._fb is not None:
+            self.fb_write(string, line)
+            self.fb_flush()
+            return
+
+        self._queueI(IMASK_DDRAM_ADDR | addr)
 
         # Output string
         self.puts(string)
 
+    def fb_write(self, string, line, col=0):
+        """Put a 'string' to framebuffer at 'line' and column 'col'.
+        Nothing is sent to controller until fb_flush() is called.
+        String is clipped at the end of DDRAM."""
+
+        if self._fb is None:
+            raise RuntimeError('Framebuffer mode is not enabled')
+        line = (line - 1) % 2 + 1
+        addr = DDRAM_ADDR[line - 1] + max(col, 0)
+        symbols = self._encode(string)[:max(DDRAM_SIZE - addr, 0)]
+        self._fb[addr:addr + len(symbols)] = bytes(symbols)
+
+    def fb_clear(self):
+        """Fill framebuffer with blanks. Nothing is sent to controller."""
+
+        if self._fb is None:
+            raise RuntimeError('Framebuffer mode is not enabled')
+        self._fb[:] = bytes([BLANK] * DDRAM_SIZE)
+
+    def _fb_spans(self):
+        """Return list of (start, end) DDRAM address spans where framebuffer
+        differs from DDRAM copy. Unchanged gaps between spans are bridged
+        when resending them costs less than Set DDRAM Address instruction."""
+
+        if self._shadow is None:
+            return [(addr, addr + DDRAM_SIZE // MAX_LINES) for addr in DDRAM_ADDR]
+        cost_data = COST_BYTE if self._buffered else COST_BYTE + COST_BF
+        cost_addr = COST_BYTE + COST_BF
+        spans = []
+        for addr in range(DDRAM_SIZE):
+            if self._fb[addr] == self._shadow[addr]:
+                continue
+            if spans and (addr - spans[-1][1]) * cost_data <= cost_addr:
+                spans[-1] = (spans[-1][0], addr + 1)
+            else:
+                spans.append((addr, addr + 1))
+        return spans
+
+    def _write_span(self, start, end, symbols):
+        """Write 'symbols' to DDRAM addresses from 'start' up to 'end' (exclusive).
+        Auto-increment or auto-decrement is used according to Entry Mode,
+        address set is dropped by peephole if address counter is already there."""
+
+        first = start if self._increment else end - 1
+        self._queueI(IMASK_DDRAM_ADDR | first)
+        if not self._increment:
+            symbols = symbols[::-1]
+        self._sendDrun(symbols)
+
+    def fb_flush(self):
+        """Send framebuffer changes to controller."""
+
+        if self._fb is None:
+            raise RuntimeError('Framebuffer mode is not enabled')
+        spans = [(start, end, bytes(self._fb[start:end])) for (start, end) in self._fb_spans()]
+        full = self._shadow is None
+        self._write_spans(spans)
+        if full:
+            self._shadow = bytearray(self._fb)
+
+    @staticmethod
+    def _cell_spans(cells):
+        """Return list of (start, end, symbols) spans of contiguous runs of
+        DDRAM 'cells' {addr: symbol}."""
+
+        spans = []
+        for addr in sorted(cells):
+            if spans and spans[-1][1] == addr:
+                spans[-1][1] = addr + 1
+                spans[-1][2].append(cells[addr])
+            else:
+                spans.append([addr, addr + 1, [cells[addr]]])
+        return spans
+
+    def _write_spans(self, spans):
+        """Write list of (start, end, symbols) spans to DDRAM."""
+
+        if not spans:
+            return
+
+        # Display shift on entry would scroll screen while writing
+        shift = self._display_shift
+        if shift:
+            self.emode_set(display_shift=False)
+        for (start, end, symbols) in spans:
+            self._write_span(start, end, symbols)
+        if shift:
+            self.emode_set(display_shift=True)
+
+    def write_many(self, fields):
+        """Output batch of positioned strings.
+        'fields' is iterable of (line, col, string) tuples. Fields are merged
+        by DDRAM address (later field wins where they overlap) and contiguous
+        segments are written by auto-increment after single Set DDRAM Address.
+        In framebuffer mode only changed characters are sent."""
+
+        cells = {}
+        pinned = set()
+        for (line, col, string) in fields:
+            line = (line - 1) % 2 + 1
+            addr = DDRAM_ADDR[line - 1] + max(col, 0)
+            for symbol in self._encode(string, pinned):
+                if addr >= DDRAM_SIZE:
+                    break
+                cells[addr] = symbol
+                addr += 1
+
+        if self._fb is not None:
+            for (addr, symbol) in cells.items():
+                self._fb[addr] = symbol
+            self.fb_flush()
+            return
+
+        self._write_spans(self._cell_spans(cells))
+
+    def glyph_define(self, char, rows, fallback=' '):
+        """Define custom glyph shown for character 'char'.
+        'rows' are up to 8 integers of pixel rows from top, bit 4 is the left pixel.
+        'fallback' character is shown instead when glyph is not in CGRAM.
+        Glyphs are uploaded to CGRAM on first use in output strings,
+        redefined glyph in CGRAM is uploaded at once."""
+
+        rows = bytes([r & 0x1F for r in rows][:GLYPH_ROWS]).ljust(GLYPH_ROWS, b'\0')
+        old = self._glyphs.get(char)
+        self._glyphs[char] = (rows, fallback)
+        slot = self._slots.get(char)
+        if slot is not None and old[0] != rows:
+            with self.deferred():
+                restore = self._glyph_ac()
+                self._glyph_upload(slot, rows)
+                self._queueI(restore)
+
+    def glyph_load(self, chars):
+        """Make custom glyphs of characters 'chars' resident in CGRAM at once,
+        e.g. before switching to screen using them. Glyphs of more than
+        8 characters do not fit, their fallback characters are used.
+        Return dictionary of symbol codes (or fallback characters) by character."""
+
+        chars = [c for c in dict.fromkeys(chars) if c in self._glyphs]
+        return self._glyph_codes(chars)
+
+    def _glyph_ac(self):
+        """Return instruction restoring current address counter."""
+
+        ac = self._get_ac()
+        return (IMASK_CGRAM_ADDR if self._ac_cgram else IMASK_DDRAM_ADDR) | ac
+
+    def _glyph_codes(self, chars, pinned=None):
+        """Return dictionary of symbol codes of custom glyph characters 'chars'
+        (as str of one character for translate()). Missing glyphs are uploaded
+        to free or least recently used CGRAM slots. Slots of set 'pinned'
+        (slots used by the current output) are not evicted, slots of 'chars'
+        are added to it. Glyph which does not fit gets its fallback character."""
+
+        if pinned is None:
+            pinned = set()
+        codes = {}
+        uploads = []
+        evicted = []
+        # Resident glyphs are pinned first, missing ones must not evict them
+        missing = []
+        for c in chars:
+            slot = self._slots.get(c)
+            if slot is None:
+                missing.append(c)
+                continue
+            self._slots.move_to_end(c)
+            pinned.add(slot)
+            codes[c] = chr(slot)
+        for c in missing:
+            slot = self._glyph_alloc(pinned, evicted)
+            if slot is None:
+                codes[c] = self._glyphs[c][1]
+                continue
+            self._slots[c] = slot
+            uploads.append((slot, self._glyphs[c][0]))
+            pinned.add(slot)
+            codes[c] = chr(slot)
+        if uploads:
+            with self.deferred():
+                restore = self._glyph_ac()
+                if evicted:
+                    self._glyph_replace(evicted)
+                for (slot, rows) in uploads:
+                    self._glyph_upload(slot, rows)
+                self._queueI(restore)
+        return codes
+
+    def _glyph_alloc(self, pinned, evicted):
+        """Return free CGRAM slot, or slot of least recently used glyph not in
+        'pinned' preferring glyphs not referenced by DDRAM. Slot and fallback
+        of evicted glyph referenced by DDRAM are appended to 'evicted'.
+        Return None if all slots are pinned."""
+
+        used = set(self._slots.values())
+        for slot in range(CGRAM_SLOTS):
+            if slot not in used:
+                return slot
+        candidates = [c for (c, slot) in self._slots.items() if slot not in pinned]
+        if not candidates:
+            return None
+        shown = set(self.snapshot(cached=True))
+        if self._fb is not None:
+            shown.update(self._fb)
+        victim = next((c for c in candidates if self._slots[c] not in shown), candidates[0])
+        slot = self._slots.pop(victim)
+        if slot in shown:
+            evicted.append((slot, self._glyphs[victim][1]))
+        return slot
+
+    def _glyph_replace(self, evicted):
+        """Replace symbol codes of (slot, fallback) 'evicted' glyphs in DDRAM
+        and framebuffer by fallback characters."""
+
+        cells = {}
+        for (slot, fallback) in evicted:
+            symbol = fallback.encode(self._codec, ERRORS_MASK)[0]
+            if self._fb is not None:
+                for addr in range(DDRAM_SIZE):
+                    if self._fb[addr] == slot:
+                        self._fb[addr] = symbol
+            for addr in range(DDRAM_SIZE):
+                if self._shadow[addr] == slot:
+                    cells[addr] = symbol
+        self._write_spans(self._cell_spans(cells))
+
+    def _glyph_upload(self, slot, rows):
+        """Write pixel 'rows' of glyph to CGRAM 'slot'."""
+
+        if self._increment:
+            self._queueI(IMASK_CGRAM_ADDR | slot * GLYPH_ROWS)
+            self._sendDrun(rows)
+        else:
+            self._queueI(IMASK_CGRAM_ADDR | slot * GLYPH_ROWS + GLYPH_ROWS - 1)
+            self._sendDrun(rows[::-1])
+
+    def gfx_begin(self, width=GRAPHICS_WIDTH, height=GRAPHICS_HEIGHT):
+        """Switch controller to graphics mode and return bitmap to draw on.
+        Bitmap is sent to controller by gfx_flush()."""
+
+        if self.gfx is None or (self.gfx.width, self.gfx.height) != (width, height):
+            self.gfx = Bitmap(width, height)
+        self._gfx_shadow = None
+        self.gcmpwr_set(graphics_mode=True)
+        return self.gfx
+
+    def gfx_end(self):
+        """Switch controller back to character mode."""
+
+        self.gcmpwr_set(graphics_mode=False)
+
+    def _gfx_runs(self):
+        """Return list of (page, start, end) column runs of bitmap to be sent.
+        Unchanged gaps between runs of a page are bridged when resending them
+        costs less than Set DDRAM Address instruction."""
+
+        gfx = self.gfx
+        if self._gfx_shadow is None:
+            return [(page, 0, gfx.width) for page in range(gfx.pages)]
+        cost_data = COST_BYTE if self._buffered else COST_BYTE + COST_BF
+        cost_addr = COST_BYTE + COST_BF
+        runs = []
+        for (page, start, end) in gfx.changes(self._gfx_shadow):
+            if runs and runs[-1][0] == page and (start - runs[-1][2]) * cost_data <= cost_addr:
+                runs[-1] = (page, runs[-1][1], end)
+            else:
+                runs.append((page, start, end))
+        return runs
+
+    def gfx_flush(self):
+        """Send bitmap columns changed since the previous flush to controller.
+        In graphics mode Set CGRAM Address selects page and Set DDRAM Address
+        selects column, column bytes are written by auto-increment.
+        Controller must be in graphics mode (see gfx_begin())."""
+
+        if self.gfx is None or not self._graphics_mode:
+            raise RuntimeError('Graphics mode is not enabled')
+        runs = self._gfx_runs()
+        if not runs:
+            return
+        increment = self._increment
+        shift = self._display_shift
+        with self.deferred():
+            if not increment or shift:
+                self.emode_set(increment=True, display_shift=False)
+            page = None
+            for (p, start, end) in runs:
+                if p != page:
+                    self._queueI(IMASK_CGRAM_ADDR | p)
+                    page = p
+                self._queueI(IMASK_DDRAM_ADDR | start)
+                self._sendDrun(self.gfx.page(p)[start:end])
+            if not increment or shift:
+                self.emode_set(increment=increment, display_shift=shift)
+        self._gfx_shadow = self.gfx.tobytes()
+
     def set_ddram_addr(self, ac=0):
         """Set DDRAM address. If address 'ac' is not passed it will be 0. """
 
@@ -363,60 +1279,95 @@ class WS0010:
             ac = 0
         if ac > DDRAM_SIZE:
             ac = DDRAM_SIZE - 1
-        self._sendI(IMASK_DDRAM_ADDR | ac)
+        self._queueI(IMASK_DDRAM_ADDR | ac)
 
-    def read_ddram(self, ac=0, size=1):
-        """Read 'size' bytes of data from 'ac' position."""
+    def _decode(self, symbols):
+        """Convert controller symbols to string by codec of font table."""
 
-        if ac < 0:
-            ac = 0
-        if ac > DDRAM_SIZE:
-            ac = DDRAM_SIZE - 1
-        if size < 1:
-            size = 1
-        if size > DDRAM_SIZE:
-            size = DDRAM_SIZE
+        string = bytes(symbols).decode(self._codec)
+        if self._slots:
+            string = string.translate({slot: c for (c, slot) in self._slots.items()})
+        return string
 
-        # Save current address and set it to 'ac'
-        saved_ac = self.getAC()
-        self._sendI(IMASK_DDRAM_ADDR | ac)
+    def _read_raw(self, ac, size):
+        """Read 'size' bytes of DDRAM from 'ac' position by one batched strobed read.
+        Return bytearray. Address counter is left after the last byte read."""
 
-        # Set RS and R/W pins
-        ctl = PIN_RS | PIN_RW | PIN_DATA
-        ctl_en = ctl | PIN_EN
-        self._device.write8(ctl)
+        self._queueI(IMASK_DDRAM_ADDR | ac)
 
-        # Read DDRAM
-        str = ''
-        while size:
-
-            # Read high nibble of DDRAM location
-            self._device.write8(ctl_en)
-            symbol = (self._device.read8() & 0xF) << 4
-            self._device.write8(ctl)
+        # Read DDRAM with RS and R/W pins set
+        if self._iqueue:
+            self._drainI()
+        if self._timed:
+            self._wait_ready()
+        self._flush()
+        ctl = PIN_RS | PIN_RW | PIN_DATA
+        nibbles = self._strobe_read(ctl, size * 2)
 
-            # Read low nibble of DDRAM location
-            self._device.write8(ctl_en)
-            symbol |= self._device.read8() & 0xF
-            self._device.write8(ctl)
+        # Combine high and low nibbles of DDRAM locations
+        data = bytearray(size)
+        for i in range(size):
+            data[i] = (nibbles[2 * i] & 0xF) << 4 | nibbles[2 * i + 1] & 0xF
 
-            # Convert symbol to character
-            try:
-                char = UNTRANSLATE_RU[symbol]
-            except KeyError:
-                char = chr(symbol)
-            str += char
+        # Clear RS and R/W pins
+        self._write8(0)
 
-            # Decrement size
-            size -= 1
+        # Reading moved AC as writing does
+        step = 1 if self._increment else -1
+        self._ac = (ac + step * size) % DDRAM_SIZE
+        return data
 
-        # Clear RS and R/W pins
-        self._device.write8(0)
+    def read_ddram(self, ac=0, size=1, cached=True):
+        """Read 'size' bytes of data from 'ac' position.
+        If host copy of DDRAM is trusted and 'cached' is True,
+        data are taken from the copy without bus access."""
 
-        # Restore saved address counter
-        self._sendI(IMASK_DDRAM_ADDR | saved_ac)
+        if ac < 0:
+            ac = 0
+        if ac > DDRAM_SIZE:
+            ac = DDRAM_SIZE - 1
+        if size < 1:
+            size = 1
+        if size > DDRAM_SIZE:
+            size = DDRAM_SIZE
 
-        return str
+        if self._iqueue:
+            self._drainI()
+        if cached and self._shadow is not None:
+            step = 1 if self._increment else -1
+            return self._decode(self._shadow[(ac + step * i) % DDRAM_SIZE] for i in range(size))
+
+        # Save current address, read from 'ac' and restore saved address counter
+        saved_ac = self._get_ac()
+        data = self._read_raw(ac, size)
+        self._queueI(IMASK_DDRAM_ADDR | saved_ac)
+
+        return self._decode(data)
+
+    def snapshot(self, cached=False):
+        """Return contents of DDRAM rows of all display lines as bytes
+        (row of line N starts at offset (N - 1) * DDRAM_SIZE / lines).
+        DDRAM is read by one batched pass and becomes trusted host copy.
+        If 'cached' is True the host copy is returned when it is trusted."""
+
+        if self._iqueue:
+            self._drainI()
+        if cached and self._shadow is not None:
+            return bytes(self._shadow)
+        saved_ac = self._get_ac()
+        increment = self._increment
+        if not increment:
+            self.emode_set(increment=True)
+        data = self._read_raw(0, DDRAM_SIZE)
+        if not increment:
+            self.emode_set(increment=False)
+        self._queueI(IMASK_DDRAM_ADDR | saved_ac)
+        if self._iqueue:
+            self._drainI()
+        self._shadow = data
+        if self._fb is not None:
+            self._fb[:] = data
+        return bytes(data)
 
     def move_cursor(self, count=1):
         """Move cursor. Argument 'count' defines direction and steps number.
@@ -425,18 +1376,20 @@ class WS0010:
         If 'count' not provided value 1 assumed (one step ahead or right)
         For one step (positive or negative) instruction 'Cursor/Display Shift' used.
         For more than one step set directly by means of instruction 'Set DDRAM Address'.
-        Real change calculated as current AC plus 'count' modulo DDRAM_SIZE."""
+        Real change calculated as current AC plus 'count' modulo DDRAM_SIZE.
+        Current AC is taken from software model, it is read from controller
+        only if the model is invalidated."""
 
         if count == 0:
             pass
         elif count == 1:
-            self._sendI(IMASK_CURS_DISP_SHIFT | PMASK_SHIFT_MOVE_RIGHT)
+            self._queueI(IMASK_CURS_DISP_SHIFT | PMASK_SHIFT_MOVE_RIGHT)
         elif count == -1:
-            self._sendI(IMASK_CURS_DISP_SHIFT)
+            self._queueI(IMASK_CURS_DISP_SHIFT)
         else:
-            cur_ac = self.getAC()
+            cur_ac = self._get_ac()
             new_ac = (cur_ac + count) % DDRAM_SIZE
-            self._sendI(IMASK_DDRAM_ADDR | new_ac)
+            self._queueI(IMASK_DDRAM_ADDR | new_ac)
 
     def shift_display(self, count=1):
         """Shift display. Argument 'count' defines direction and steps number.
@@ -445,13 +1398,14 @@ class WS0010:
         If 'count' not provided value 1 assumed (one step ahead or right)
         For any steps value instruction 'Cursor/Display Shift' used.
         Real change calculated as absolute value of 'count' modulo DDRAM_SIZE
-        divided by lines number."""
+        divided by lines number, and taken the short way round."""
 
         if count != 0:
             mod_count = abs(count) % int(DDRAM_SIZE / self._lines)
             instr = IMASK_CURS_DISP_SHIFT | PMASK_DISP_SHIFT
             if count > 0:
                 instr |= PMASK_SHIFT_MOVE_RIGHT
-            while mod_count:
-                self._sendI(instr)
-                mod_count -= 1
+            with self.deferred():
+                while mod_count:
+                    self._queueI(instr)
+                    mod_count -= 1